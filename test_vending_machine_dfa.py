@@ -0,0 +1,59 @@
+"""Check the derived DFA tables against the hand-written transition function."""
+
+import unittest
+
+from vending_machine_dfa import DELTA_TBL, DISPENSE_TBL, STATE_IDX, STATE_NAMES, SYM_IDX, SYMBOLS
+
+# δ as originally written out by hand in vending_machine_streamlit.py
+DELTA = {
+    'Q0':  {'RM5': 'Q1',  'RM10': 'Q2',  'RM20': 'Q4',  'e': 'Q0',  'v': 'Q0'},
+    'Q1':  {'RM5': 'Q2',  'RM10': 'Q3',  'RM20': 'Q5',  'e': 'Q1',  'v': 'Q1'},
+    'Q2':  {'RM5': 'Q3',  'RM10': 'Q4',  'RM20': 'Q6',  'e': 'Q2',  'v': 'Q2'},
+    'Q3':  {'RM5': 'Q4',  'RM10': 'Q5',  'RM20': 'Q7',  'e': 'Q3',  'v': 'Q3'},
+    'Q4':  {'RM5': 'Q5',  'RM10': 'Q6',  'RM20': 'Q8',  'e': 'Q4',  'v': 'Q4'},
+    'Q5':  {'RM5': 'Q6',  'RM10': 'Q7',  'RM20': 'Q9',  'e': 'Q5',  'v': 'Q5'},
+    'Q6':  {'RM5': 'Q7',  'RM10': 'Q8',  'RM20': 'Q10', 'e': 'Q6',  'v': 'Q6'},
+    'Q7':  {'RM5': 'Q8',  'RM10': 'Q9',  'RM20': 'Q10', 'e': 'Q0',  'v': 'Q7'},
+    'Q8':  {'RM5': 'Q9',  'RM10': 'Q10', 'RM20': 'Q10', 'e': 'Q0',  'v': 'Q8'},
+    'Q9':  {'RM5': 'Q10', 'RM10': 'Q10', 'RM20': 'Q10', 'e': 'Q0',  'v': 'Q9'},
+    'Q10': {'RM5': 'Q10', 'RM10': 'Q10', 'RM20': 'Q10', 'e': 'Q0',  'v': 'Q0'},
+}
+
+# The only transitions that dispense a product
+DISPENSED = {
+    ('Q7', 'e'): 'Eye Drop',
+    ('Q8', 'e'): 'Eye Drop',
+    ('Q9', 'e'): 'Eye Drop',
+    ('Q10', 'e'): 'Eye Drop',
+    ('Q10', 'v'): 'Vitamin',
+}
+
+
+class TestDFATables(unittest.TestCase):
+
+    def test_table_shapes(self):
+        self.assertEqual(DELTA_TBL.shape, (len(STATE_NAMES), len(SYMBOLS)))
+        self.assertEqual(len(DISPENSE_TBL), len(STATE_NAMES))
+        self.assertTrue(all(len(row) == len(SYMBOLS) for row in DISPENSE_TBL))
+
+    def test_delta_matches_hand_written_table(self):
+        for state, row in DELTA.items():
+            for symbol, target in row.items():
+                with self.subTest(state=state, symbol=symbol):
+                    self.assertEqual(
+                        STATE_NAMES[DELTA_TBL[STATE_IDX[state], SYM_IDX[symbol]]], target)
+
+    def test_dispense_table(self):
+        for state in STATE_NAMES:
+            for symbol in SYMBOLS:
+                with self.subTest(state=state, symbol=symbol):
+                    self.assertEqual(DISPENSE_TBL[STATE_IDX[state]][SYM_IDX[symbol]],
+                                     DISPENSED.get((state, symbol)))
+
+    def test_delta_is_read_only(self):
+        with self.assertRaises(ValueError):
+            DELTA_TBL[0, 0] = 1
+
+
+if __name__ == '__main__':
+    unittest.main()
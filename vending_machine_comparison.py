@@ -13,14 +13,173 @@ Products:
 
 import tkinter as tk
 from tkinter import ttk, messagebox
+from tkinter import font as tkfont
 import math
+from array import array
+
+# Products that a transition can dispense, indexed by the codes in _DISPENSE
+_DISPENSED = (None, 'Eye Drop', 'Vitamin')
+
+def _number_states(cls):
+    """Set _STATE_ID and _SYM_ID, numbering states and symbols by position."""
+    cls._STATE_ID = {s: i for i, s in enumerate(cls.STATES)}
+    cls._SYM_ID = {s: i for i, s in enumerate(cls.SIGMA)}
+
+
+def _flatten_delta(cls):
+    """Flatten a DFA's nested DELTA dict into a row-major int table.
+
+    States and symbols are numbered by their position in STATES and SIGMA,
+    so the next state of (sid, sym_id) is _TABLE[sid * _NSYM + sym_id].
+    _DISPENSE holds the matching index into _DISPENSED for each transition,
+    and the per-state predicates and balances are stored in parallel arrays.
+    """
+    _number_states(cls)
+    cls._INIT_SID = cls._STATE_ID[cls.INITIAL]
+    cls._NSYM = len(cls.SIGMA)
+    table, dispense = array('h'), bytearray()
+    for state in cls.STATES:
+        row = cls.DELTA.get(state, {})
+        for symbol in cls.SIGMA:
+            # Missing transitions are baked in as self-loops
+            target = row.get(symbol, state)
+            table.append(cls._STATE_ID[target])
+            dispense.append(_DISPENSED.index(cls._dispensed(state, symbol, target)))
+    cls._TABLE = table
+    cls._DISPENSE = bytes(dispense)
+    cls._ACCEPT_BITS = bytes(s in cls.ACCEPTING for s in cls.STATES)
+    cls._CAN_E_BITS = bytes(s in cls.ACCEPTING_EYE for s in cls.STATES)
+    cls._CAN_V_BITS = bytes(s in cls.ACCEPTING_VIT for s in cls.STATES)
+    cls._BALANCE = array('B', [cls.STATE_INFO[s][0] for s in cls.STATES])
+    return cls
+
+
+def _or_masks(masks):
+    """Bitwise OR of an iterable of masks."""
+    result = 0
+    for mask in masks:
+        result |= mask
+    return result
+
+
+def _precompute_nfa_masks(cls):
+    """Number the NFA states and precompute their moves as bitmasks.
+
+    Bit i of a mask stands for STATES[i]. _ECLOSE[i] is the epsilon closure
+    of state i, and _STEP[sym_id][i] is everything reachable from state i on
+    that symbol with the closure already applied, so one NFA step is an OR
+    over the set bits of the current mask.
+    """
+    _number_states(cls)
+
+    # Epsilon reachability via Floyd-Warshall transitive closure
+    n = len(cls.STATES)
+    reach = [bytearray(n) for _ in range(n)]
+    for i, state in enumerate(cls.STATES):
+        reach[i][i] = 1
+        for next_state in cls.DELTA.get(state, {}).get('eps', ()):
+            reach[i][cls._STATE_ID[next_state]] = 1
+    for k in range(n):
+        row_k = reach[k]
+        for row_i in reach:
+            if row_i[k]:
+                for j in range(n):
+                    row_i[j] |= row_k[j]
+    eclose = [sum(1 << j for j in range(n) if row[j]) for row in reach]
+    cls._ECLOSE = eclose
+
+    cls._STEP = [
+        [_or_masks(eclose[cls._STATE_ID[t]] for t in cls.DELTA.get(s, {}).get(symbol, ()))
+         for s in cls.STATES]
+        for symbol in cls.SIGMA
+    ]
+    cls._ACCEPT_MASK = sum(1 << cls._STATE_ID[s] for s in cls.ACCEPTING)
+    cls._INIT_MASK = eclose[cls._STATE_ID[cls.INITIAL]]
+    return cls
+
+
+class _TableDFA:
+    """Runtime shared by the table-driven automata.
+
+    DFA subclasses are built with @_flatten_delta, which provides the
+    flattened tables these methods index by state id. NFASimulator fills
+    the same per-state tables from its subset construction.
+    """
+
+    __slots__ = ('_sid', '_hist_old', '_hist_sym', '_hist_new')
+
+    def __init__(self):
+        self._sid = self._INIT_SID
+        self._hist_old = array('H')
+        self._hist_sym = array('B')
+        self._hist_new = array('H')
+
+    @property
+    def current_state(self):
+        return self.STATES[self._sid]
+
+    @property
+    def history(self):
+        """Transition log as (old, symbol, new) tuples, built on demand."""
+        states, sigma = self.STATES, self.SIGMA
+        return [(states[o], sigma[k], states[n])
+                for o, k, n in zip(self._hist_old, self._hist_sym, self._hist_new)]
+
+    def transition(self, symbol):
+        return self.transition_id(self._SYM_ID[symbol])
+
+    def transition_id(self, sym_id):
+        """Apply the symbol SIGMA[sym_id]; returns (old, new, dispensed)."""
+        old_sid = self._sid
+        i = old_sid * self._NSYM + sym_id
+        new_sid = self._TABLE[i]
+        dispensed = _DISPENSED[self._DISPENSE[i]]
+        self._sid = new_sid
+        self._hist_old.append(old_sid)
+        self._hist_sym.append(sym_id)
+        self._hist_new.append(new_sid)
+        return self.STATES[old_sid], self.STATES[new_sid], dispensed
+
+    @classmethod
+    def run_batch(cls, symbols):
+        """Run a whole input sequence from INITIAL and return the final state.
+
+        Skips history and dispense bookkeeping, for bulk simulation.
+        """
+        table, nsym, sym_id = cls._TABLE, cls._NSYM, cls._SYM_ID
+        sid = cls._INIT_SID
+        for symbol in symbols:
+            sid = table[sid * nsym + sym_id[symbol]]
+        return cls.STATES[sid]
+
+    def reset(self):
+        self._sid = self._INIT_SID
+        self._hist_old = array('H')
+        self._hist_sym = array('B')
+        self._hist_new = array('H')
+
+    def get_balance(self):
+        return self._BALANCE[self._sid]
+
+    def is_accepting(self):
+        return bool(self._ACCEPT_BITS[self._sid])
+
+    def can_buy_eye_drop(self):
+        return bool(self._CAN_E_BITS[self._sid])
+
+    def can_buy_vitamin(self):
+        return bool(self._CAN_V_BITS[self._sid])
+
 
 # ============================================================
 # 1. ORIGINAL DFA (Single Path)
 # ============================================================
-class OriginalDFA:
+@_flatten_delta
+class OriginalDFA(_TableDFA):
     """Original DFA - Single shared state path."""
 
+    __slots__ = ()
+
     NAME = "Original DFA"
     DESCRIPTION = "Single state path shared by both products"
 
@@ -28,6 +187,8 @@ class OriginalDFA:
     SIGMA = ['RM5', 'RM10', 'RM20', 'e', 'v']
     INITIAL = 'Q0'
     ACCEPTING = {'Q7', 'Q8', 'Q9', 'Q10'}
+    ACCEPTING_EYE = ACCEPTING
+    ACCEPTING_VIT = {'Q10'}
 
     DELTA = {
         'Q0':  {'RM5': 'Q1',  'RM10': 'Q2',  'RM20': 'Q4',  'e': 'Q0',  'v': 'Q0'},
@@ -51,43 +212,49 @@ class OriginalDFA:
         'Q10': (50, 'Both Ready'),
     }
 
-    def __init__(self):
-        self.current_state = self.INITIAL
-        self.history = []
-
-    def transition(self, symbol):
-        old = self.current_state
-        new = self.DELTA.get(old, {}).get(symbol, old)
-        dispensed = None
-        if old in self.ACCEPTING and new == 'Q0':
-            dispensed = 'Eye Drop' if symbol == 'e' else 'Vitamin' if symbol == 'v' else None
-        self.current_state = new
-        self.history.append((old, symbol, new))
-        return old, new, dispensed
-
-    def reset(self):
-        self.current_state = self.INITIAL
-        self.history = []
-
-    def get_balance(self):
-        return self.STATE_INFO.get(self.current_state, (0, ''))[0]
-
-    def is_accepting(self):
-        return self.current_state in self.ACCEPTING
-
-    def can_buy_eye_drop(self):
-        return self.current_state in self.ACCEPTING
-
-    def can_buy_vitamin(self):
-        return self.current_state == 'Q10'
+    @classmethod
+    def _dispensed(cls, old, symbol, new):
+        """Product dispensed by old --symbol--> new (used to build _DISPENSE)."""
+        if old in cls.ACCEPTING and new == 'Q0':
+            return 'Eye Drop' if symbol == 'e' else 'Vitamin' if symbol == 'v' else None
+        return None
 
 
 # ============================================================
 # 2. TWO-LINE DFA (Parallel Product Paths)
 # ============================================================
-class TwoLineDFA:
+def _two_line_delta(eye_steps, vit_steps):
+    """Build the Two-Line DFA transitions from (product, balance) pairs.
+
+    E{k} and V{k} both mean "k x RM5 inserted" on one product line, so each
+    row is generated from the shared balance arithmetic instead of being
+    written out twice:
+    - coins add 1, 2 or 4 steps, saturating at the line's price
+    - select_e / select_v switch line keeping the balance (capped at E7)
+    - e on E7 and v on V10 dispense and return to S0; anything else stays
+    """
+    coins = (('RM5', 1), ('RM10', 2), ('RM20', 4))
+    delta = {'S0': {'select_e': 'E1', 'select_v': 'V1', 'RM5': 'S0', 'RM10': 'S0',
+                    'RM20': 'S0', 'e': 'S0', 'v': 'S0'}}
+    for line, steps, buy in (('E', eye_steps, 'e'), ('V', vit_steps, 'v')):
+        for k in range(1, steps + 1):
+            state = f'{line}{k}'
+            row = {sym: f'{line}{min(k + n, steps)}' for sym, n in coins}
+            row['e'] = row['v'] = state
+            if k == steps:
+                row[buy] = 'S0'
+            row['select_e'] = f'E{min(k, eye_steps)}'
+            row['select_v'] = f'V{k}'
+            delta[state] = row
+    return delta
+
+
+@_flatten_delta
+class TwoLineDFA(_TableDFA):
     """Two parallel state lines - one for each product."""
 
+    __slots__ = ()
+
     NAME = "Two-Line DFA"
     DESCRIPTION = "Separate state paths for Eye Drop and Vitamin"
 
@@ -100,32 +267,7 @@ class TwoLineDFA:
     ACCEPTING_VIT = {'V10'}
     ACCEPTING = ACCEPTING_EYE | ACCEPTING_VIT
 
-    # Transition table
-    DELTA = {
-        # Start - choose product first
-        'S0': {'select_e': 'E1', 'select_v': 'V1', 'RM5': 'S0', 'RM10': 'S0', 'RM20': 'S0', 'e': 'S0', 'v': 'S0'},
-
-        # Eye Drop path (need RM35)
-        'E1': {'RM5': 'E2', 'RM10': 'E3', 'RM20': 'E5', 'e': 'E1', 'v': 'E1', 'select_e': 'E1', 'select_v': 'V1'},
-        'E2': {'RM5': 'E3', 'RM10': 'E4', 'RM20': 'E6', 'e': 'E2', 'v': 'E2', 'select_e': 'E2', 'select_v': 'V2'},
-        'E3': {'RM5': 'E4', 'RM10': 'E5', 'RM20': 'E7', 'e': 'E3', 'v': 'E3', 'select_e': 'E3', 'select_v': 'V3'},
-        'E4': {'RM5': 'E5', 'RM10': 'E6', 'RM20': 'E7', 'e': 'E4', 'v': 'E4', 'select_e': 'E4', 'select_v': 'V4'},
-        'E5': {'RM5': 'E6', 'RM10': 'E7', 'RM20': 'E7', 'e': 'E5', 'v': 'E5', 'select_e': 'E5', 'select_v': 'V5'},
-        'E6': {'RM5': 'E7', 'RM10': 'E7', 'RM20': 'E7', 'e': 'E6', 'v': 'E6', 'select_e': 'E6', 'select_v': 'V6'},
-        'E7': {'RM5': 'E7', 'RM10': 'E7', 'RM20': 'E7', 'e': 'S0', 'v': 'E7', 'select_e': 'E7', 'select_v': 'V7'},
-
-        # Vitamin path (need RM50)
-        'V1':  {'RM5': 'V2',  'RM10': 'V3',  'RM20': 'V5',  'e': 'V1',  'v': 'V1',  'select_e': 'E1',  'select_v': 'V1'},
-        'V2':  {'RM5': 'V3',  'RM10': 'V4',  'RM20': 'V6',  'e': 'V2',  'v': 'V2',  'select_e': 'E2',  'select_v': 'V2'},
-        'V3':  {'RM5': 'V4',  'RM10': 'V5',  'RM20': 'V7',  'e': 'V3',  'v': 'V3',  'select_e': 'E3',  'select_v': 'V3'},
-        'V4':  {'RM5': 'V5',  'RM10': 'V6',  'RM20': 'V8',  'e': 'V4',  'v': 'V4',  'select_e': 'E4',  'select_v': 'V4'},
-        'V5':  {'RM5': 'V6',  'RM10': 'V7',  'RM20': 'V9',  'e': 'V5',  'v': 'V5',  'select_e': 'E5',  'select_v': 'V5'},
-        'V6':  {'RM5': 'V7',  'RM10': 'V8',  'RM20': 'V10', 'e': 'V6',  'v': 'V6',  'select_e': 'E6',  'select_v': 'V6'},
-        'V7':  {'RM5': 'V8',  'RM10': 'V9',  'RM20': 'V10', 'e': 'V7',  'v': 'V7',  'select_e': 'E7',  'select_v': 'V7'},
-        'V8':  {'RM5': 'V9',  'RM10': 'V10', 'RM20': 'V10', 'e': 'V8',  'v': 'V8',  'select_e': 'E7',  'select_v': 'V8'},
-        'V9':  {'RM5': 'V10', 'RM10': 'V10', 'RM20': 'V10', 'e': 'V9',  'v': 'V9',  'select_e': 'E7',  'select_v': 'V9'},
-        'V10': {'RM5': 'V10', 'RM10': 'V10', 'RM20': 'V10', 'e': 'V10', 'v': 'S0',  'select_e': 'E7',  'select_v': 'V10'},
-    }
+    DELTA = _two_line_delta(eye_steps=7, vit_steps=10)
 
     STATE_INFO = {
         'S0': (0, 'Select Product'),
@@ -138,45 +280,25 @@ class TwoLineDFA:
         'V10': (50, 'Vitamin: READY'),
     }
 
-    def __init__(self):
-        self.current_state = self.INITIAL
-        self.history = []
-
-    def transition(self, symbol):
-        old = self.current_state
-        new = self.DELTA.get(old, {}).get(symbol, old)
-        dispensed = None
-        if old in self.ACCEPTING_EYE and new == 'S0' and symbol == 'e':
-            dispensed = 'Eye Drop'
-        elif old in self.ACCEPTING_VIT and new == 'S0' and symbol == 'v':
-            dispensed = 'Vitamin'
-        self.current_state = new
-        self.history.append((old, symbol, new))
-        return old, new, dispensed
-
-    def reset(self):
-        self.current_state = self.INITIAL
-        self.history = []
-
-    def get_balance(self):
-        return self.STATE_INFO.get(self.current_state, (0, ''))[0]
-
-    def is_accepting(self):
-        return self.current_state in self.ACCEPTING
-
-    def can_buy_eye_drop(self):
-        return self.current_state in self.ACCEPTING_EYE
-
-    def can_buy_vitamin(self):
-        return self.current_state in self.ACCEPTING_VIT
+    @classmethod
+    def _dispensed(cls, old, symbol, new):
+        """Product dispensed by old --symbol--> new (used to build _DISPENSE)."""
+        if old in cls.ACCEPTING_EYE and new == 'S0' and symbol == 'e':
+            return 'Eye Drop'
+        if old in cls.ACCEPTING_VIT and new == 'S0' and symbol == 'v':
+            return 'Vitamin'
+        return None
 
 
 # ============================================================
 # 3. NFA (Non-deterministic Finite Automaton)
 # ============================================================
-class NFASimulator:
+@_precompute_nfa_masks
+class NFASimulator(_TableDFA):
     """NFA with epsilon transitions - can be in multiple states."""
 
+    __slots__ = ()
+
     NAME = "NFA"
     DESCRIPTION = "Non-deterministic with epsilon (e) transitions"
 
@@ -214,83 +336,219 @@ class NFASimulator:
         'DISPENSE': (0, 'Dispensing...'),
     }
 
-    def __init__(self):
-        self.current_states = {self.INITIAL}
-        self.history = []
-        self._apply_epsilon_closure()
-
-    def _epsilon_closure(self, states):
-        """Compute epsilon closure of a set of states."""
-        closure = set(states)
-        stack = list(states)
-        while stack:
-            state = stack.pop()
-            for next_state in self.DELTA.get(state, {}).get('eps', set()):
-                if next_state not in closure:
-                    closure.add(next_state)
-                    stack.append(next_state)
-        return closure
-
-    def _apply_epsilon_closure(self):
-        """Apply epsilon closure to current states."""
-        self.current_states = self._epsilon_closure(self.current_states)
-
-    def transition(self, symbol):
-        old_states = self.current_states.copy()
-        new_states = set()
+    # Subset-construction tables, built on first use by _build_dfa()
+    _DFA_DELTA = None
+    _INIT_SID = 0
 
-        for state in self.current_states:
-            next_states = self.DELTA.get(state, {}).get(symbol, set())
-            new_states.update(next_states)
-
-        if new_states:
-            self.current_states = self._epsilon_closure(new_states)
+    def __init__(self):
+        if self._DFA_DELTA is None:
+            type(self)._build_dfa()
+        super().__init__()
+
+    @classmethod
+    def _states_of(cls, mask):
+        """Expand a state bitmask into the set of state names."""
+        states = set()
+        while mask:
+            low = mask & -mask
+            states.add(cls.STATES[low.bit_length() - 1])
+            mask ^= low
+        return states
+
+    @classmethod
+    def _step_mask(cls, mask, symbol):
+        """Apply one NFA step to a state bitmask.
+
+        Returns the next mask and the dispensed product (if any).
+        """
+        step = cls._STEP[cls._SYM_ID[symbol]]
+        new_mask = 0
+        rest = mask
+        while rest:
+            low = rest & -rest
+            new_mask |= step[low.bit_length() - 1]
+            rest ^= low
+
+        if new_mask:
+            mask = new_mask
 
         # Check for dispense
         dispensed = None
-        if 'DISPENSE' in self.current_states:
+        if mask >> cls._STATE_ID['DISPENSE'] & 1:
             if symbol == 'dispense_e':
                 dispensed = 'Eye Drop'
             elif symbol == 'dispense_v':
                 dispensed = 'Vitamin'
             # Reset after dispense
-            self.current_states = self._epsilon_closure({'Q0'})
-
-        self.history.append((old_states, symbol, self.current_states.copy()))
-        return old_states, self.current_states.copy(), dispensed
-
-    def reset(self):
-        self.current_states = {self.INITIAL}
-        self._apply_epsilon_closure()
-        self.history = []
-
-    def get_balance(self):
-        # Return max balance from current states
-        max_bal = 0
-        for state in self.current_states:
-            bal = self.STATE_INFO.get(state, (0, ''))[0]
-            if bal > max_bal:
-                max_bal = bal
-        return max_bal
-
-    def is_accepting(self):
-        return bool(self.current_states & self.ACCEPTING)
+            mask = cls._ECLOSE[cls._STATE_ID['Q0']]
+        return mask, dispensed
+
+    @classmethod
+    def _build_dfa(cls):
+        """Subset-construct an equivalent DFA over the reachable state masks.
+
+        DFA state 0 (_INIT_SID) is _INIT_MASK, the closure of the initial state.
+        """
+        masks = [cls._INIT_MASK]
+        id_of = {cls._INIT_MASK: cls._INIT_SID}
+        delta = []
+        dispense = []
+        i = 0
+        while i < len(masks):
+            row, drow = [], []
+            for symbol in cls.SIGMA:
+                target, dispensed = cls._step_mask(masks[i], symbol)
+                if target not in id_of:
+                    id_of[target] = len(masks)
+                    masks.append(target)
+                row.append(id_of[target])
+                drow.append(dispensed)
+            delta.append(row)
+            dispense.append(drow)
+            i += 1
+
+        eye_bit = 1 << cls._STATE_ID['EYE_READY']
+        vit_bit = 1 << cls._STATE_ID['VIT_READY']
+        cls._ID_TO_SUBSET = [frozenset(cls._states_of(m)) for m in masks]
+        cls._ID_TO_LABEL = [', '.join(sorted(subset)) for subset in cls._ID_TO_SUBSET]
+        cls._DFA_DELTA = delta
+        cls._DFA_DISPENSE = dispense
+        cls._ACCEPT_BITS = bytes(bool(m & cls._ACCEPT_MASK) for m in masks)
+        cls._CAN_E_BITS = bytes(bool(m & eye_bit) for m in masks)
+        cls._CAN_V_BITS = bytes(bool(m & vit_bit) for m in masks)
+        # Balance of a subset is the max balance over its member states
+        cls._BALANCE = array('B', [max(cls.STATE_INFO[st][0] for st in subset)
+                                       for subset in cls._ID_TO_SUBSET])
 
-    def can_buy_eye_drop(self):
-        return 'EYE_READY' in self.current_states
+    @property
+    def current_states(self):
+        return self._ID_TO_SUBSET[self._sid]
 
-    def can_buy_vitamin(self):
-        return 'VIT_READY' in self.current_states
+    @property
+    def history(self):
+        """Transition log as (old_states, symbol, new_states), built on demand."""
+        subsets, sigma = self._ID_TO_SUBSET, self.SIGMA
+        return [(subsets[o], sigma[k], subsets[n])
+                for o, k, n in zip(self._hist_old, self._hist_sym, self._hist_new)]
+
+    def transition_id(self, sym_id):
+        """Apply the symbol SIGMA[sym_id]; returns (old, new, dispensed)."""
+        old_sid = self._sid
+        self._sid = new_sid = self._DFA_DELTA[old_sid][sym_id]
+        self._hist_old.append(old_sid)
+        self._hist_sym.append(sym_id)
+        self._hist_new.append(new_sid)
+        # Subsets are shared frozensets, so no snapshot copies are needed
+        subsets = self._ID_TO_SUBSET
+        return subsets[old_sid], subsets[new_sid], self._DFA_DISPENSE[old_sid][sym_id]
+
+    @classmethod
+    def run_batch(cls, symbols):
+        """Run a whole input sequence from INITIAL and return the final states.
+
+        Skips history and dispense bookkeeping, for bulk simulation.
+        """
+        if cls._DFA_DELTA is None:
+            cls._build_dfa()
+        delta, sym_id = cls._DFA_DELTA, cls._SYM_ID
+        sid = cls._INIT_SID
+        for symbol in symbols:
+            sid = delta[sid][sym_id[symbol]]
+        return cls._ID_TO_SUBSET[sid]
 
     @property
     def current_state(self):
         """For compatibility - return string representation of current states."""
-        return ', '.join(sorted(self.current_states))
+        return self._ID_TO_LABEL[self._sid]
 
 
 # ============================================================
 # GUI WITH TABS
 # ============================================================
+# Bernstein weights for the 21 bezier samples t = 0, 1/20, ..., 1
+_BEZ_T = [i / 20.0 for i in range(21)]
+_BEZ2 = tuple(((1-t)**2, 2*(1-t)*t, t**2) for t in _BEZ_T)
+_BEZ3 = tuple(((1-t)**3, 3*(1-t)**2*t, 3*(1-t)*t**2, t**3) for t in _BEZ_T)
+
+
+def _quad_bezier_points(x0, y0, cx, cy, x1, y1):
+    """Flat [x, y, ...] samples of a quadratic bezier curve."""
+    points = [0.0] * (2 * len(_BEZ2))
+    points[0::2] = [b0 * x0 + b1 * cx + b2 * x1 for b0, b1, b2 in _BEZ2]
+    points[1::2] = [b0 * y0 + b1 * cy + b2 * y1 for b0, b1, b2 in _BEZ2]
+    return points
+
+
+def _cubic_bezier_points(x0, y0, c1x, c1y, c2x, c2y, x1, y1):
+    """Flat [x, y, ...] samples of a cubic bezier curve."""
+    points = [0.0] * (2 * len(_BEZ3))
+    points[0::2] = [b0 * x0 + b1 * c1x + b2 * c2x + b3 * x1 for b0, b1, b2, b3 in _BEZ3]
+    points[1::2] = [b0 * y0 + b1 * c1y + b2 * c2y + b3 * y1 for b0, b1, b2, b3 in _BEZ3]
+    return points
+
+
+# Self-loop arrowheads: 7px sides at +/-30 degrees from the loop's end tangent
+_ARROW_SIZE = 7
+_COS30 = math.cos(math.pi / 6)
+_SIN30 = math.sin(math.pi / 6)
+
+# Money buttons: (symbol, background color)
+_MONEY_BUTTONS = (('RM5', '#4CAF50'), ('RM10', '#2196F3'), ('RM20', '#9C27B0'))
+
+# Named fonts for canvas text, created once by ComparisonGUI so text items
+# refer to a resolved font instead of re-parsing a font tuple each time
+_DIAGRAM_FONTS = {
+    'diagram_bold7': {'family': 'Arial', 'size': 7, 'weight': 'bold'},
+    'diagram_bold8': {'family': 'Arial', 'size': 8, 'weight': 'bold'},
+    'diagram_bold9': {'family': 'Arial', 'size': 9, 'weight': 'bold'},
+    'diagram_bold10': {'family': 'Arial', 'size': 10, 'weight': 'bold'},
+    'diagram_italic9': {'family': 'Arial', 'size': 9, 'slant': 'italic'},
+}
+
+# Active arrow color by arrow_type; inactive arrows are grey
+_ACTIVE_COLORS = {
+    'RM5': '#4CAF50',     # Green
+    'RM10': '#2196F3',    # Blue
+    'RM20': '#9C27B0',    # Purple
+    'return': '#F44336',  # Red
+    'self': '#FF9800',    # Orange
+    'select': '#4CAF50',
+}
+# (inactive, active) line and label styles, built once per arrow_type.
+# Labels of inactive arrows are hidden: dozens of them cluttered the
+# diagram, and only the outgoing arrows of the current state need one.
+_ARROW_STYLES = {
+    arrow_type: (({'fill': '#E0E0E0', 'width': 1}, {'fill': color, 'width': 2.5}),
+                 ({'state': 'hidden'},
+                  {'state': 'normal', 'fill': color, 'font': 'diagram_bold8'}))
+    for arrow_type, color in _ACTIVE_COLORS.items()
+}
+
+
+def _arrow_styles(arrow_type):
+    """(line_style, text_style) pair for an arrow_type, green if unknown."""
+    return _ARROW_STYLES.get(arrow_type, _ARROW_STYLES['RM5'])
+
+
+# Static edge lists for the DFA diagrams (from_state, to_state)
+_ORIG_TOP_ROW = tuple(f'Q{i}' for i in range(7))
+_ORIG_BOTTOM_ROW = ('Q7', 'Q8', 'Q9', 'Q10')
+_ORIG_RM5 = (tuple(zip(_ORIG_TOP_ROW, _ORIG_TOP_ROW[1:]))
+             + tuple(zip(_ORIG_BOTTOM_ROW, _ORIG_BOTTOM_ROW[1:])))
+_ORIG_RM10 = (('Q0', 'Q2'), ('Q1', 'Q3'), ('Q2', 'Q4'), ('Q3', 'Q5'),
+              ('Q4', 'Q6'), ('Q5', 'Q7'), ('Q6', 'Q8'),
+              ('Q7', 'Q9'), ('Q8', 'Q10'))
+_ORIG_RM20 = (('Q0', 'Q4'), ('Q1', 'Q5'), ('Q2', 'Q6'), ('Q3', 'Q7'),
+              ('Q4', 'Q8'), ('Q5', 'Q9'), ('Q6', 'Q10'))
+# Return arrows to Q0: (state, label, curve offset)
+_ORIG_RETURNS = (('Q7', 'e', 40), ('Q8', 'e', 60), ('Q9', 'e', 80), ('Q10', 'e,v', 100))
+
+_TWOLINE_EYE_PATH = tuple(f'E{i}' for i in range(1, 8))
+_TWOLINE_VIT_PATH = tuple(f'V{i}' for i in range(1, 11))
+_TWOLINE_RM5 = (tuple(zip(_TWOLINE_EYE_PATH, _TWOLINE_EYE_PATH[1:]))
+                + tuple(zip(_TWOLINE_VIT_PATH, _TWOLINE_VIT_PATH[1:])))
+
+
 class ComparisonGUI:
     def __init__(self):
         self.root = tk.Tk()
@@ -298,6 +556,10 @@ class ComparisonGUI:
         self.root.geometry("1300x750")
         self.root.configure(bg='#f5f5f5')
 
+        # Keep references: a named font is deleted with its Font object
+        self.fonts = {name: tkfont.Font(self.root, name=name, **spec)
+                      for name, spec in _DIAGRAM_FONTS.items()}
+
         # Create notebook (tabs)
         self.notebook = ttk.Notebook(self.root)
         self.notebook.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
@@ -308,12 +570,66 @@ class ComparisonGUI:
 
         automaton_classes = [OriginalDFA, TwoLineDFA, NFASimulator]
 
+        # Tabs start as placeholders; the machine and widgets of each are
+        # built the first time it is selected (see build_tab)
+        self.unbuilt = {}
         for cls in automaton_classes:
             tab = ttk.Frame(self.notebook)
             self.notebook.add(tab, text=cls.NAME)
             self.tabs[cls.NAME] = tab
-            self.machines[cls.NAME] = cls()
-            self.create_tab_content(tab, cls)
+            self.unbuilt[cls.NAME] = cls
+            tab.placeholder = tk.Label(tab, text="Loading…", font=('Arial', 11),
+                                       fg='#757575')
+            tab.placeholder.pack(expand=True)
+
+        # Hidden tabs defer their redraws until shown (see finish_resize)
+        self.visible_tab = None
+        self.notebook.bind('<<NotebookTabChanged>>', self.on_tab_changed)
+        self.on_tab_changed()
+
+    def build_tab(self, name):
+        """Replace a tab's placeholder with its automaton and widgets."""
+        cls = self.unbuilt.pop(name)
+        tab = self.tabs[name]
+        tab.placeholder.destroy()
+        self.machines[name] = cls()
+        self.bind_formatters(tab, self.machines[name])
+        self.create_tab_content(tab, cls)
+
+    def on_tab_changed(self, event=None):
+        """Track the selected tab, building it or catching up on a redraw
+        it missed."""
+        name = self.notebook.tab(self.notebook.select(), 'text')
+        self.visible_tab = name
+        if name in self.unbuilt:
+            self.build_tab(name)
+            return
+        tab = self.tabs[name]
+        if tab.dirty:
+            tab.dirty = False
+            self.finish_resize(name)
+
+    def bind_formatters(self, tab, machine):
+        """Pick the per-automaton state accessors once, instead of isinstance
+        checks on every input.
+
+        tab.current_set() gives the set of current states, tab.state_text()
+        the state label text and tab.format_states(s) a history log entry.
+        """
+        tab.shows_current_text = isinstance(machine, NFASimulator)
+        if isinstance(machine, NFASimulator):
+            tab.current_set = lambda: machine.current_states
+            tab.state_text = lambda: '\n'.join(sorted(machine.current_states))
+            tab.format_states = lambda states: ', '.join(sorted(states))
+            tab.draw = self.draw_nfa
+        else:
+            tab.current_set = lambda: {machine.current_state}
+            tab.state_text = lambda: machine.current_state
+            tab.format_states = str
+            if isinstance(machine, OriginalDFA):
+                tab.draw = self.draw_original_dfa
+            else:
+                tab.draw = self.draw_twoline_dfa
 
     def create_tab_content(self, tab, automaton_class):
         """Create content for a tab."""
@@ -357,6 +673,7 @@ class ComparisonGUI:
         tab.state_label = state_label
         tab.status_label = status_label
         tab.balance_label = balance_label
+        tab.applied = {}  # widget -> options last applied by set_options
 
         # For Two-Line DFA, add product selection buttons
         if automaton_class == TwoLineDFA:
@@ -369,12 +686,14 @@ class ComparisonGUI:
 
             tk.Button(sel_cols, text="Eye Drop\nPath", font=('Arial', 10, 'bold'),
                      width=10, height=2, bg='#FF9800', fg='white',
-                     command=lambda: self.process_input(automaton_class.NAME, 'select_e')
+                     command=lambda i=automaton_class._SYM_ID['select_e']:
+                         self.process_input(automaton_class.NAME, i)
                      ).pack(side=tk.LEFT, padx=5, pady=5)
 
             tk.Button(sel_cols, text="Vitamin\nPath", font=('Arial', 10, 'bold'),
                      width=10, height=2, bg='#E91E63', fg='white',
-                     command=lambda: self.process_input(automaton_class.NAME, 'select_v')
+                     command=lambda i=automaton_class._SYM_ID['select_v']:
+                         self.process_input(automaton_class.NAME, i)
                      ).pack(side=tk.LEFT, padx=5, pady=5)
 
         # Money buttons
@@ -385,10 +704,11 @@ class ComparisonGUI:
         btn_frame = tk.Frame(money_frame, bg='white')
         btn_frame.pack()
 
-        for amount, color in [('RM5', '#4CAF50'), ('RM10', '#2196F3'), ('RM20', '#9C27B0')]:
+        for amount, color in _MONEY_BUTTONS:
             tk.Button(btn_frame, text=amount, font=('Arial', 12, 'bold'),
                      width=6, height=2, bg=color, fg='white', cursor='hand2',
-                     command=lambda a=amount, n=automaton_class.NAME: self.process_input(n, a)
+                     command=lambda i=automaton_class._SYM_ID[amount], n=automaton_class.NAME:
+                         self.process_input(n, i)
                      ).pack(side=tk.LEFT, padx=3, pady=5)
 
         # Product buttons
@@ -406,14 +726,16 @@ class ComparisonGUI:
         eye_btn = tk.Button(prod_cols, text="Eye Drop\n(RM35)",
                            font=('Arial', 11, 'bold'), width=10, height=2,
                            bg='#FF9800', fg='white', cursor='hand2',
-                           command=lambda: self.process_input(automaton_class.NAME, eye_symbol))
+                           command=lambda i=automaton_class._SYM_ID[eye_symbol]:
+                               self.process_input(automaton_class.NAME, i))
         eye_btn.pack(side=tk.LEFT, padx=5, pady=5)
         tab.eye_btn = eye_btn
 
         vit_btn = tk.Button(prod_cols, text="Vitamin\n(RM50)",
                            font=('Arial', 11, 'bold'), width=10, height=2,
                            bg='#E91E63', fg='white', cursor='hand2',
-                           command=lambda: self.process_input(automaton_class.NAME, vit_symbol))
+                           command=lambda i=automaton_class._SYM_ID[vit_symbol]:
+                               self.process_input(automaton_class.NAME, i))
         vit_btn.pack(side=tk.LEFT, padx=5, pady=5)
         tab.vit_btn = vit_btn
 
@@ -429,6 +751,8 @@ class ComparisonGUI:
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         history_text.pack(fill=tk.BOTH, expand=True)
         tab.history_text = history_text
+        tab.history_buf = []
+        tab.history_job = None
 
         # Reset button
         tk.Button(control_frame, text="Reset", font=('Arial', 10),
@@ -443,83 +767,161 @@ class ComparisonGUI:
 
         canvas = tk.Canvas(diagram_frame, bg='white', highlightthickness=0)
         canvas.pack(fill=tk.BOTH, expand=True)
+        canvas.tracked = {}
+        canvas.drawn_current = set()
         tab.canvas = canvas
 
-        # Bind resize
-        canvas.bind('<Configure>', lambda e, n=automaton_class.NAME: self.draw_diagram(n))
+        # Bind resize (coalesced, see schedule_resize)
+        tab.resize_job = None
+        tab.last_wh = None
+        tab.dirty = False
+        tab.last_sig = None
+        tab.display_job = None
+        canvas.bind('<Configure>', lambda e, n=automaton_class.NAME: self.schedule_resize(n))
 
-        # Initial update
-        self.update_display(automaton_class.NAME)
+        # Initial labels; the diagram is first drawn by <Configure>
+        self.update_labels(automaton_class.NAME)
 
-    def process_input(self, name, symbol):
-        """Process input for a specific automaton."""
-        machine = self.machines[name]
-        old, new, dispensed = machine.transition(symbol)
+    def schedule_resize(self, name):
+        """Coalesce a burst of <Configure> events into a single redraw."""
+        tab = self.tabs[name]
+        if tab.resize_job is not None:
+            self.root.after_cancel(tab.resize_job)
+        tab.resize_job = self.root.after(30, self.finish_resize, name)
 
-        # Log
+    def finish_resize(self, name):
+        """Redraw after a resize burst, unless the canvas size is unchanged."""
         tab = self.tabs[name]
-        tab.history_text.config(state=tk.NORMAL)
+        tab.resize_job = None
+        if name != self.visible_tab:
+            tab.dirty = True
+            return
+        canvas = tab.canvas
+        if (canvas.winfo_width(), canvas.winfo_height()) != tab.last_wh:
+            self.draw_diagram(name)
 
-        if isinstance(machine, NFASimulator):
-            old_str = ', '.join(sorted(old)) if isinstance(old, set) else old
-            new_str = ', '.join(sorted(new)) if isinstance(new, set) else new
-        else:
-            old_str, new_str = old, new
+    def process_input(self, name, sym_id):
+        """Process input (a symbol id from the machine's SIGMA) for an automaton."""
+        machine = self.machines[name]
+        old, new, dispensed = machine.transition_id(sym_id)
+        symbol = machine.SIGMA[sym_id]
 
-        tab.history_text.insert(tk.END, f"  {old_str} --[{symbol}]--> {new_str}\n")
-        tab.history_text.see(tk.END)
-        tab.history_text.config(state=tk.DISABLED)
+        # Log
+        tab = self.tabs[name]
+        old_str = tab.format_states(old)
+        new_str = tab.format_states(new)
+        self.log_history(name, f"  {old_str} --[{symbol}]--> {new_str}\n")
 
         if dispensed:
+            # Show the log line before the modal dialog blocks the loop
+            self.flush_history(name)
             messagebox.showinfo("Dispensed!", f"{dispensed} has been dispensed!")
 
+        self.schedule_display(name)
+
+    def schedule_display(self, name):
+        """Update the display once the event loop is idle.
+
+        A burst of inputs (e.g. fast repeated clicks) then costs a single
+        update showing the final state.
+        """
+        tab = self.tabs[name]
+        if tab.display_job is None:
+            tab.display_job = self.root.after_idle(self.flush_display, name)
+
+    def flush_display(self, name):
+        """Run a pending display update now."""
+        tab = self.tabs[name]
+        if tab.display_job is not None:
+            self.root.after_cancel(tab.display_job)
+            tab.display_job = None
         self.update_display(name)
 
+    def log_history(self, name, line):
+        """Queue a history line; lines are written in one batch when idle."""
+        tab = self.tabs[name]
+        tab.history_buf.append(line)
+        if tab.history_job is None:
+            tab.history_job = self.root.after_idle(self.flush_history, name)
+
+    def flush_history(self, name):
+        """Write all queued history lines with a single insert."""
+        tab = self.tabs[name]
+        if tab.history_job is not None:
+            self.root.after_cancel(tab.history_job)
+            tab.history_job = None
+        if not tab.history_buf:
+            return
+
+        tab.history_text.config(state=tk.NORMAL)
+        tab.history_text.insert(tk.END, ''.join(tab.history_buf))
+        tab.history_text.see(tk.END)
+        tab.history_text.config(state=tk.DISABLED)
+        tab.history_buf.clear()
+
     def reset_machine(self, name):
         """Reset a specific automaton."""
         machine = self.machines[name]
         machine.reset()
 
         tab = self.tabs[name]
+        tab.history_buf.clear()
         tab.history_text.config(state=tk.NORMAL)
         tab.history_text.delete(1.0, tk.END)
         tab.history_text.insert(tk.END, "--- Reset ---\n")
         tab.history_text.config(state=tk.DISABLED)
 
-        self.update_display(name)
+        self.schedule_display(name)
 
     def update_display(self, name):
         """Update display for a specific automaton."""
+        if self.update_labels(name):
+            self.refresh_diagram(name)
+
+    def update_labels(self, name):
+        """Update the state, balance and button widgets.
+
+        Returns False, touching nothing, when the displayed values are
+        unchanged since the last update.
+        """
         machine = self.machines[name]
         tab = self.tabs[name]
 
-        # Update state label
-        if isinstance(machine, NFASimulator):
-            state_text = '\n'.join(sorted(machine.current_states))
-        else:
-            state_text = machine.current_state
+        state_text = tab.state_text()
+        accepting = machine.is_accepting()
+        balance = machine.get_balance()
+        can_eye = machine.can_buy_eye_drop()
+        can_vit = machine.can_buy_vitamin()
 
-        tab.state_label.config(text=state_text)
+        # Nothing visible changed (e.g. a self-loop or a repeated reset)
+        sig = (state_text, accepting, balance, can_eye, can_vit)
+        if sig == tab.last_sig:
+            return False
+        tab.last_sig = sig
 
-        # Update status
-        if machine.is_accepting():
-            tab.state_label.config(fg='#4CAF50')
-            tab.status_label.config(text="[ACCEPT]", fg='#4CAF50')
+        # Update state label and status
+        if accepting:
+            self.set_options(tab, tab.state_label, text=state_text, fg='#4CAF50')
+            self.set_options(tab, tab.status_label, text="[ACCEPT]", fg='#4CAF50')
         else:
-            tab.state_label.config(fg='#1976D2')
-            tab.status_label.config(text="[REJECT]", fg='#757575')
+            self.set_options(tab, tab.state_label, text=state_text, fg='#1976D2')
+            self.set_options(tab, tab.status_label, text="[REJECT]", fg='#757575')
 
         # Update balance
-        tab.balance_label.config(text=f"Balance: RM{machine.get_balance()}")
+        self.set_options(tab, tab.balance_label, text=f"Balance: RM{balance}")
 
         # Update buttons
-        can_eye = machine.can_buy_eye_drop()
-        can_vit = machine.can_buy_vitamin()
-        tab.eye_btn.config(bg='#4CAF50' if can_eye else '#FF9800')
-        tab.vit_btn.config(bg='#4CAF50' if can_vit else '#E91E63')
-
-        # Redraw diagram
-        self.draw_diagram(name)
+        self.set_options(tab, tab.eye_btn, bg='#4CAF50' if can_eye else '#FF9800')
+        self.set_options(tab, tab.vit_btn, bg='#4CAF50' if can_vit else '#E91E63')
+        return True
+
+    def set_options(self, tab, widget, **options):
+        """Configure a widget, skipping options that already have that value."""
+        applied = tab.applied.setdefault(widget, {})
+        changed = {k: v for k, v in options.items() if applied.get(k) != v}
+        if changed:
+            widget.config(**changed)
+            applied.update(changed)
 
     def draw_diagram(self, name):
         """Draw state diagram for specific automaton."""
@@ -528,127 +930,152 @@ class ComparisonGUI:
         canvas = tab.canvas
 
         canvas.delete("all")
+        canvas.tracked = {}
 
         w = canvas.winfo_width()
         h = canvas.winfo_height()
 
         if w < 50 or h < 50:
             return
-
-        # Get current state(s)
-        if isinstance(machine, NFASimulator):
-            current = machine.current_states
-        else:
-            current = {machine.current_state}
+        tab.last_wh = (w, h)
 
         # Draw based on automaton type
-        if isinstance(machine, OriginalDFA):
-            self.draw_original_dfa(canvas, w, h, machine, current)
-        elif isinstance(machine, TwoLineDFA):
-            self.draw_twoline_dfa(canvas, w, h, machine, current)
-        elif isinstance(machine, NFASimulator):
-            self.draw_nfa(canvas, w, h, machine, current)
-
-    def draw_arrow(self, canvas, x1, y1, x2, y2, label, active=False, arrow_type='RM5'):
+        current = tab.current_set()
+        tab.draw(canvas, w, h, machine, current)
+        canvas.drawn_current = set(current)
+
+    def refresh_diagram(self, name):
+        """Update the diagram for a state change without recreating items.
+
+        Only items owned by states that entered or left the current set are
+        reconfigured; geometry changes go through draw_diagram instead.
+        """
+        tab = self.tabs[name]
+        canvas = tab.canvas
+        current = tab.current_set()
+
+        for state in canvas.drawn_current ^ current:
+            is_current = state in current
+            for item, styles in canvas.tracked.get(state, ()):
+                canvas.itemconfig(item, **styles[is_current])
+        canvas.drawn_current = set(current)
+
+        if tab.shows_current_text:
+            states_str = tab.format_states(current)
+            canvas.itemconfig('current_states', text=f"Current: {{{states_str}}}")
+
+    @staticmethod
+    def original_positions(w, h):
+        """State positions for the Original DFA diagram."""
+        positions = {}
+
+        # Q0-Q6 in top row
+        for i, state in enumerate(_ORIG_TOP_ROW):
+            x = 60 + i * (w - 140) / 6
+            y = h * 0.25
+            positions[state] = (x, y)
+
+        # Q7-Q10 in bottom row
+        for i, state in enumerate(_ORIG_BOTTOM_ROW):
+            x = 60 + (i + 3) * (w - 140) / 6
+            y = h * 0.65
+            positions[state] = (x, y)
+
+        return positions
+
+    @staticmethod
+    def twoline_positions(w, h):
+        """State positions for the Two-Line DFA diagram."""
+        positions = {}
+
+        # Start state
+        positions['S0'] = (50, h / 2)
+
+        # Eye Drop path (top row) - E1 to E7
+        for i, state in enumerate(_TWOLINE_EYE_PATH, 1):
+            x = 100 + i * (w - 180) / 8
+            y = h * 0.28
+            positions[state] = (x, y)
+
+        # Vitamin path (bottom row) - V1 to V10
+        for i, state in enumerate(_TWOLINE_VIT_PATH, 1):
+            x = 80 + i * (w - 150) / 11
+            y = h * 0.72
+            positions[state] = (x, y)
+
+        return positions
+
+    def track(self, canvas, owner, item, styles):
+        """Remember an item's (inactive, active) options, keyed by its state.
+
+        refresh_diagram() re-applies these when the owner state's
+        activity changes, instead of redrawing the whole canvas.
+        """
+        canvas.tracked.setdefault(owner, []).append((item, styles))
+
+    def draw_arrow(self, canvas, x1, y1, x2, y2, label, active=False, arrow_type='RM5', owner=None):
         """Draw an arrow between two points with active/inactive coloring."""
-        # Color scheme based on arrow type
-        if active:
-            if arrow_type == 'RM5' or 'RM5' in label:
-                color = '#4CAF50'  # Green
-            elif arrow_type == 'RM10' or 'RM10' in label:
-                color = '#2196F3'  # Blue
-            elif arrow_type == 'RM20' or 'RM20' in label:
-                color = '#9C27B0'  # Purple
-            elif arrow_type == 'return':
-                color = '#F44336'  # Red
-            elif arrow_type == 'self':
-                color = '#FF9800'  # Orange
-            else:
-                color = '#4CAF50'
-            width = 2.5
-            text_color = color
-        else:
-            color = '#E0E0E0'  # Grey inactive
-            width = 1
-            text_color = '#BDBDBD'
+        line_style, text_style = _arrow_styles(arrow_type)
 
-        canvas.create_line(x1, y1, x2, y2, arrow=tk.LAST, fill=color, width=width,
-                          arrowshape=(10, 12, 4))
+        line = canvas.create_line(x1, y1, x2, y2, arrow=tk.LAST, arrowshape=(10, 12, 4),
+                                  **line_style[active])
 
         # Label at midpoint
         mid_x = (x1 + x2) / 2
         mid_y = (y1 + y2) / 2 - 10
-        label_font = ('Arial', 8, 'bold') if active else ('Arial', 7)
-        canvas.create_text(mid_x, mid_y, text=label, font=label_font, fill=text_color)
+        text = canvas.create_text(mid_x, mid_y, text=label, **text_style[active])
+
+        if owner is not None:
+            self.track(canvas, owner, line, line_style)
+            self.track(canvas, owner, text, text_style)
 
-    def draw_curved_arrow(self, canvas, x1, y1, x2, y2, label, active=False, arrow_type='RM5', curve_offset=30):
+    def draw_curved_arrow(self, canvas, x1, y1, x2, y2, label, active=False, arrow_type='RM5', curve_offset=30,
+                          owner=None):
         """Draw a curved arrow with bezier curve."""
-        if active:
-            if 'RM5' in label:
-                color = '#4CAF50'
-            elif 'RM10' in label:
-                color = '#2196F3'
-            elif 'RM20' in label:
-                color = '#9C27B0'
-            elif arrow_type == 'return':
-                color = '#F44336'
-            else:
-                color = '#4CAF50'
-            width = 2.5
-            text_color = color
-        else:
-            color = '#E0E0E0'
-            width = 1
-            text_color = '#BDBDBD'
+        line_style, text_style = _arrow_styles(arrow_type)
 
         # Control point for curve
         ctrl_x = (x1 + x2) / 2
         ctrl_y = (y1 + y2) / 2 + curve_offset
 
         # Generate bezier points
-        points = []
-        for i in range(21):
-            t = i / 20.0
-            px = (1-t)**2 * x1 + 2*(1-t)*t * ctrl_x + t**2 * x2
-            py = (1-t)**2 * y1 + 2*(1-t)*t * ctrl_y + t**2 * y2
-            points.extend([px, py])
+        points = _quad_bezier_points(x1, y1, ctrl_x, ctrl_y, x2, y2)
 
-        if len(points) >= 4:
-            canvas.create_line(points, smooth=True, fill=color, width=width,
-                              arrow=tk.LAST, arrowshape=(10, 12, 4))
+        line = canvas.create_line(points, smooth=True, arrow=tk.LAST, arrowshape=(10, 12, 4),
+                                  **line_style[active])
 
         # Label
         label_x = ctrl_x
         label_y = ctrl_y + (10 if curve_offset >= 0 else -10)
-        label_font = ('Arial', 8, 'bold') if active else ('Arial', 7)
-        canvas.create_text(label_x, label_y, text=label, font=label_font, fill=text_color)
+        text = canvas.create_text(label_x, label_y, text=label, **text_style[active])
+
+        if owner is not None:
+            self.track(canvas, owner, line, line_style)
+            self.track(canvas, owner, text, text_style)
 
-    def draw_self_loop(self, canvas, x, y, r, label, active=False, position='top'):
+    def draw_self_loop(self, canvas, x, y, r, label, active=False, position='top', owner=None):
         """Draw a self-loop on a state with consistent sizing."""
-        if active:
-            color = '#FF9800'  # Orange for self-loops
-            text_color = '#E65100'
-            width = 2.2
-        else:
-            color = '#E0E0E0'
-            text_color = '#BDBDBD'
-            width = 1
+        # Orange for active self-loops
+        line_style = ({'fill': '#E0E0E0', 'width': 1}, {'fill': '#FF9800', 'width': 2.2})
+        head_style = ({'fill': '#E0E0E0', 'outline': '#E0E0E0'},
+                      {'fill': '#FF9800', 'outline': '#FF9800'})
+        text_style = ({'state': 'hidden'},
+                      {'state': 'normal', 'fill': '#E65100', 'font': 'diagram_bold8'})
 
         loop_size = max(16, int(r * 0.85))
-        font = ('Arial', 8, 'bold') if active else ('Arial', 7)
+        items = []
 
         def draw_arrowhead(xh, yh, dx, dy):
             length = math.hypot(dx, dy)
             if length == 0:
                 return
             ux, uy = dx / length, dy / length
-            size = 7
-            angle = math.pi / 6
-            ax1 = xh - size * (ux * math.cos(angle) - uy * math.sin(angle))
-            ay1 = yh - size * (uy * math.cos(angle) + ux * math.sin(angle))
-            ax2 = xh - size * (ux * math.cos(angle) + uy * math.sin(angle))
-            ay2 = yh - size * (uy * math.cos(angle) - ux * math.sin(angle))
-            canvas.create_polygon(xh, yh, ax1, ay1, ax2, ay2, fill=color, outline=color)
+            ax1 = xh - _ARROW_SIZE * (ux * _COS30 - uy * _SIN30)
+            ay1 = yh - _ARROW_SIZE * (uy * _COS30 + ux * _SIN30)
+            ax2 = xh - _ARROW_SIZE * (ux * _COS30 + uy * _SIN30)
+            ay2 = yh - _ARROW_SIZE * (uy * _COS30 - ux * _SIN30)
+            items.append((canvas.create_polygon(xh, yh, ax1, ay1, ax2, ay2, **head_style[active]),
+                          head_style))
 
         if position == 'top':
             start_x = x - r * 0.7
@@ -659,16 +1086,7 @@ class ComparisonGUI:
             ctrl1_y = y - r - loop_size * 1.6
             ctrl2_x = x + loop_size
             ctrl2_y = y - r - loop_size * 1.6
-
-            points = []
-            for t in [i / 20.0 for i in range(21)]:
-                px = (1-t)**3 * start_x + 3*(1-t)**2*t * ctrl1_x + 3*(1-t)*t**2 * ctrl2_x + t**3 * end_x
-                py = (1-t)**3 * start_y + 3*(1-t)**2*t * ctrl1_y + 3*(1-t)*t**2 * ctrl2_y + t**3 * end_y
-                points.extend([px, py])
-
-            canvas.create_line(points, smooth=True, fill=color, width=width)
-            draw_arrowhead(end_x, end_y, end_x - ctrl2_x, end_y - ctrl2_y)
-            canvas.create_text(x, y - r - loop_size * 1.8, text=label, font=font, fill=text_color)
+            text_pos, text_kw = (x, y - r - loop_size * 1.8), {}
         elif position == 'right':
             start_x = x + r * 0.7
             start_y = y - r * 0.5
@@ -678,16 +1096,7 @@ class ComparisonGUI:
             ctrl1_y = y - loop_size
             ctrl2_x = x + r + loop_size * 1.5
             ctrl2_y = y + loop_size
-
-            points = []
-            for t in [i / 20.0 for i in range(21)]:
-                px = (1-t)**3 * start_x + 3*(1-t)**2*t * ctrl1_x + 3*(1-t)*t**2 * ctrl2_x + t**3 * end_x
-                py = (1-t)**3 * start_y + 3*(1-t)**2*t * ctrl1_y + 3*(1-t)*t**2 * ctrl2_y + t**3 * end_y
-                points.extend([px, py])
-
-            canvas.create_line(points, smooth=True, fill=color, width=width)
-            draw_arrowhead(end_x, end_y, end_x - ctrl2_x, end_y - ctrl2_y)
-            canvas.create_text(x + r + loop_size * 2, y, text=label, font=font, fill=text_color, anchor='w')
+            text_pos, text_kw = (x + r + loop_size * 2, y), {'anchor': 'w'}
         elif position == 'bottom':
             start_x = x + r * 0.7
             start_y = y + r * 0.7
@@ -697,147 +1106,123 @@ class ComparisonGUI:
             ctrl1_y = y + r + loop_size * 1.5
             ctrl2_x = x - loop_size
             ctrl2_y = y + r + loop_size * 1.5
+            text_pos, text_kw = (x, y + r + loop_size * 2.0), {}
+        else:
+            return
+
+        points = _cubic_bezier_points(start_x, start_y, ctrl1_x, ctrl1_y,
+                                      ctrl2_x, ctrl2_y, end_x, end_y)
 
-            points = []
-            for t in [i / 20.0 for i in range(21)]:
-                px = (1-t)**3 * start_x + 3*(1-t)**2*t * ctrl1_x + 3*(1-t)*t**2 * ctrl2_x + t**3 * end_x
-                py = (1-t)**3 * start_y + 3*(1-t)**2*t * ctrl1_y + 3*(1-t)*t**2 * ctrl2_y + t**3 * end_y
-                points.extend([px, py])
+        items.append((canvas.create_line(points, smooth=True, **line_style[active]), line_style))
+        draw_arrowhead(end_x, end_y, end_x - ctrl2_x, end_y - ctrl2_y)
+        items.append((canvas.create_text(*text_pos, text=label, **text_kw, **text_style[active]),
+                      text_style))
 
-            canvas.create_line(points, smooth=True, fill=color, width=width)
-            draw_arrowhead(end_x, end_y, end_x - ctrl2_x, end_y - ctrl2_y)
-            canvas.create_text(x, y + r + loop_size * 2.0, text=label, font=font, fill=text_color)
+        if owner is not None:
+            for item, styles in items:
+                self.track(canvas, owner, item, styles)
 
-    def draw_return_arrow(self, canvas, x1, y1, x0, y0, r, label, active=False, offset=50):
+    def draw_return_arrow(self, canvas, x1, y1, x0, y0, r, label, active=False, offset=50, owner=None):
         """Draw return arrow from accepting state to Q0."""
-        if active:
-            color = '#F44336'  # Red
-            text_color = '#C62828'
-            width = 2.5
-        else:
-            color = '#E0E0E0'
-            text_color = '#BDBDBD'
-            width = 1
+        # Red when active
+        line_style = ({'fill': '#E0E0E0', 'width': 1}, {'fill': '#F44336', 'width': 2.5})
+        text_style = ({'state': 'hidden'},
+                      {'state': 'normal', 'fill': '#C62828', 'font': 'diagram_bold8'})
 
         # Curved path back to Q0
         ctrl_y = max(y1, y0) + offset
 
-        points = []
         start_x, start_y = x1 - r, y1 + r * 0.5
         end_x, end_y = x0, y0 + r
         ctrl1_x, ctrl1_y = x1 - r - 20, ctrl_y
         ctrl2_x, ctrl2_y = x0 + 20, ctrl_y
 
-        for i in range(21):
-            t = i / 20.0
-            px = (1-t)**3 * start_x + 3*(1-t)**2*t * ctrl1_x + 3*(1-t)*t**2 * ctrl2_x + t**3 * end_x
-            py = (1-t)**3 * start_y + 3*(1-t)**2*t * ctrl1_y + 3*(1-t)*t**2 * ctrl2_y + t**3 * end_y
-            points.extend([px, py])
+        points = _cubic_bezier_points(start_x, start_y, ctrl1_x, ctrl1_y,
+                                      ctrl2_x, ctrl2_y, end_x, end_y)
+
+        line = canvas.create_line(points, smooth=True, arrow=tk.LAST, arrowshape=(10, 12, 4),
+                                  **line_style[active])
+        text = canvas.create_text(start_x - 15, start_y + 15, text=label, **text_style[active])
 
-        canvas.create_line(points, smooth=True, fill=color, width=width,
-                          arrow=tk.LAST, arrowshape=(10, 12, 4))
-        label_font = ('Arial', 8, 'bold') if active else ('Arial', 7)
-        canvas.create_text(start_x - 15, start_y + 15, text=label,
-                          font=label_font, fill=text_color)
+        if owner is not None:
+            self.track(canvas, owner, line, line_style)
+            self.track(canvas, owner, text, text_style)
 
     def draw_original_dfa(self, canvas, w, h, machine, current):
         """Draw Original DFA diagram with active/inactive arrows."""
         r = 22
 
         # Position states in two rows
-        positions = {}
+        positions = self.original_positions(w, h)
 
-        # Q0-Q6 in top row
-        for i in range(7):
-            x = 60 + i * (w - 140) / 6
-            y = h * 0.25
-            positions[f'Q{i}'] = (x, y)
+        current_state = next(iter(current), 'Q0')
 
-        # Q7-Q10 in bottom row
-        for i, state in enumerate(['Q7', 'Q8', 'Q9', 'Q10']):
-            x = 60 + (i + 3) * (w - 140) / 6
-            y = h * 0.65
-            positions[state] = (x, y)
-
-        current_state = list(current)[0] if current else 'Q0'
-
-        # Draw RM5 transitions (green) - horizontal in top row
-        for i in range(6):
-            from_s, to_s = f'Q{i}', f'Q{i+1}'
+        # Draw RM5 transitions (green) - horizontal within each row
+        for from_s, to_s in _ORIG_RM5:
             x1, y1 = positions[from_s]
             x2, y2 = positions[to_s]
             active = current_state == from_s
-            self.draw_arrow(canvas, x1 + r, y1, x2 - r, y2, 'RM5', active, 'RM5')
-
-        # Draw RM5 transitions in accepting states
-        for from_s, to_s in [('Q7', 'Q8'), ('Q8', 'Q9'), ('Q9', 'Q10')]:
-            x1, y1 = positions[from_s]
-            x2, y2 = positions[to_s]
-            active = current_state == from_s
-            self.draw_arrow(canvas, x1 + r, y1, x2 - r, y2, 'RM5', active, 'RM5')
+            self.draw_arrow(canvas, x1 + r, y1, x2 - r, y2, 'RM5', active, 'RM5', owner=from_s)
 
         # Draw RM10 transitions (blue) - skip one state
-        rm10_transitions = [('Q0', 'Q2'), ('Q1', 'Q3'), ('Q2', 'Q4'), ('Q3', 'Q5'),
-                           ('Q4', 'Q6'), ('Q5', 'Q7'), ('Q6', 'Q8'),
-                           ('Q7', 'Q9'), ('Q8', 'Q10')]
-        for from_s, to_s in rm10_transitions:
+        for from_s, to_s in _ORIG_RM10:
             x1, y1 = positions[from_s]
             x2, y2 = positions[to_s]
             active = current_state == from_s
             self.draw_curved_arrow(canvas, x1, y1 + r, x2, y2 - r if y2 > y1 else y2 + r,
-                                  'RM10', active, 'RM10', 20 if y1 == y2 else -20)
+                                  'RM10', active, 'RM10', 20 if y1 == y2 else -20, owner=from_s)
 
         # Draw RM20 transitions (purple) - skip two states
-        rm20_transitions = [('Q0', 'Q4'), ('Q1', 'Q5'), ('Q2', 'Q6'), ('Q3', 'Q7'),
-                           ('Q4', 'Q8'), ('Q5', 'Q9'), ('Q6', 'Q10')]
-        for from_s, to_s in rm20_transitions:
+        for from_s, to_s in _ORIG_RM20:
             x1, y1 = positions[from_s]
             x2, y2 = positions[to_s]
             active = current_state == from_s
             self.draw_curved_arrow(canvas, x1, y1 + r, x2, y2 - r if y2 > y1 else y2 + r,
-                                  'RM20', active, 'RM20', 40)
+                                  'RM20', active, 'RM20', 40, owner=from_s)
 
         # Draw self-loops for e,v on non-accepting states
-        for i in range(7):
-            state = f'Q{i}'
+        for state in _ORIG_TOP_ROW:
             x, y = positions[state]
             active = current_state == state
-            self.draw_self_loop(canvas, x, y, r, 'e,v', active, 'top')
+            self.draw_self_loop(canvas, x, y, r, 'e,v', active, 'top', owner=state)
 
         # Draw return arrows from accepting states
         x0, y0 = positions['Q0']
-        for state in ['Q7', 'Q8', 'Q9', 'Q10']:
+        for state, label, offset in _ORIG_RETURNS:
             x1, y1 = positions[state]
             active = current_state == state
-            label = 'e' if state != 'Q10' else 'e,v'
-            offset = {'Q7': 40, 'Q8': 60, 'Q9': 80, 'Q10': 100}.get(state, 50)
-            self.draw_return_arrow(canvas, x1, y1, x0, y0, r, label, active, offset)
+            self.draw_return_arrow(canvas, x1, y1, x0, y0, r, label, active, offset, owner=state)
 
         # Draw v self-loops on Q7-Q9
-        for state in ['Q7', 'Q8', 'Q9']:
+        for state in _ORIG_BOTTOM_ROW[:-1]:
             x, y = positions[state]
             active = current_state == state
-            self.draw_self_loop(canvas, x, y, r, 'v', active, 'right')
+            self.draw_self_loop(canvas, x, y, r, 'v', active, 'right', owner=state)
 
         # Money self-loop on Q10
         x10, y10 = positions['Q10']
         active = current_state == 'Q10'
-        self.draw_self_loop(canvas, x10, y10, r, 'RM*', active, 'right')
+        self.draw_self_loop(canvas, x10, y10, r, 'RM*', active, 'right', owner='Q10')
 
         # Draw states (on top of arrows)
         for state, (x, y) in positions.items():
             is_current = state in current
             is_accepting = state in machine.ACCEPTING
 
-            fill = '#4CAF50' if is_current and is_accepting else '#2196F3' if is_current else 'white'
+            # (inactive, active) styles for the state circle and its name
+            fill_style = ({'fill': 'white'}, {'fill': '#4CAF50' if is_accepting else '#2196F3'})
+            text_style = ({'fill': '#333'}, {'fill': 'white'})
             outline = '#333'
-            text_color = 'white' if is_current else '#333'
 
             if is_accepting:
                 canvas.create_oval(x-r-4, y-r-4, x+r+4, y+r+4, outline=outline, width=2)
 
-            canvas.create_oval(x-r, y-r, x+r, y+r, fill=fill, outline=outline, width=2)
-            canvas.create_text(x, y, text=state, font=('Arial', 9, 'bold'), fill=text_color)
+            oval = canvas.create_oval(x-r, y-r, x+r, y+r, outline=outline, width=2,
+                                      **fill_style[is_current])
+            text = canvas.create_text(x, y, text=state, font='diagram_bold9',
+                                      **text_style[is_current])
+            self.track(canvas, state, oval, fill_style)
+            self.track(canvas, state, text, text_style)
 
         # Draw initial arrow
         x0, y0 = positions['Q0']
@@ -847,24 +1232,9 @@ class ComparisonGUI:
         """Draw Two-Line DFA diagram with active/inactive arrows."""
         r = 18
 
-        positions = {}
+        positions = self.twoline_positions(w, h)
 
-        # Start state
-        positions['S0'] = (50, h / 2)
-
-        # Eye Drop path (top row) - E1 to E7
-        for i in range(1, 8):
-            x = 100 + i * (w - 180) / 8
-            y = h * 0.28
-            positions[f'E{i}'] = (x, y)
-
-        # Vitamin path (bottom row) - V1 to V10
-        for i in range(1, 11):
-            x = 80 + i * (w - 150) / 11
-            y = h * 0.72
-            positions[f'V{i}'] = (x, y)
-
-        current_state = list(current)[0] if current else 'S0'
+        current_state = next(iter(current), 'S0')
 
         # Draw selection arrows from S0
         x0, y0 = positions['S0']
@@ -874,38 +1244,29 @@ class ComparisonGUI:
         # S0 -> E1 (select eye drop)
         active = current_state == 'S0'
         self.draw_curved_arrow(canvas, x0 + r, y0 - r*0.5, xe1 - r, ye1 + r*0.5,
-                              'select_e', active, 'select', -30)
+                              'select_e', active, 'select', -30, owner='S0')
 
         # S0 -> V1 (select vitamin)
         self.draw_curved_arrow(canvas, x0 + r, y0 + r*0.5, xv1 - r, yv1 - r*0.5,
-                              'select_v', active, 'select', 30)
-
-        # Draw Eye Drop path transitions (E1 -> E7)
-        for i in range(1, 7):
-            from_s, to_s = f'E{i}', f'E{i+1}'
-            x1, y1 = positions[from_s]
-            x2, y2 = positions[to_s]
-            active = current_state == from_s
-            self.draw_arrow(canvas, x1 + r, y1, x2 - r, y2, 'RM5', active, 'RM5')
+                              'select_v', active, 'select', 30, owner='S0')
 
-        # Draw Vitamin path transitions (V1 -> V10)
-        for i in range(1, 10):
-            from_s, to_s = f'V{i}', f'V{i+1}'
+        # Draw path transitions (E1 -> E7, V1 -> V10)
+        for from_s, to_s in _TWOLINE_RM5:
             x1, y1 = positions[from_s]
             x2, y2 = positions[to_s]
             active = current_state == from_s
-            self.draw_arrow(canvas, x1 + r, y1, x2 - r, y2, 'RM5', active, 'RM5')
+            self.draw_arrow(canvas, x1 + r, y1, x2 - r, y2, 'RM5', active, 'RM5', owner=from_s)
 
         # Draw return arrows from accepting states
         # E7 -> S0 (dispense eye drop)
         xe7, ye7 = positions['E7']
         active = current_state == 'E7'
-        self.draw_return_arrow(canvas, xe7, ye7, x0, y0, r, 'e', active, 50)
+        self.draw_return_arrow(canvas, xe7, ye7, x0, y0, r, 'e', active, 50, owner='E7')
 
         # V10 -> S0 (dispense vitamin)
         xv10, yv10 = positions['V10']
         active = current_state == 'V10'
-        self.draw_return_arrow(canvas, xv10, yv10, x0, y0, r, 'v', active, 70)
+        self.draw_return_arrow(canvas, xv10, yv10, x0, y0, r, 'v', active, 70, owner='V10')
 
         # Draw states (on top of arrows)
         for state, (x, y) in positions.items():
@@ -920,21 +1281,25 @@ class ComparisonGUI:
             else:
                 base_color = '#2196F3'
 
-            fill = base_color if is_current else 'white'
-            text_color = 'white' if is_current else '#333'
+            fill_style = ({'fill': 'white'}, {'fill': base_color})
+            text_style = ({'fill': '#333'}, {'fill': 'white'})
 
             if is_accepting:
                 canvas.create_oval(x-r-4, y-r-4, x+r+4, y+r+4, outline='#333', width=2)
 
-            canvas.create_oval(x-r, y-r, x+r, y+r, fill=fill, outline='#333', width=2)
-            canvas.create_text(x, y, text=state, font=('Arial', 8, 'bold'), fill=text_color)
+            oval = canvas.create_oval(x-r, y-r, x+r, y+r, outline='#333', width=2,
+                                      **fill_style[is_current])
+            text = canvas.create_text(x, y, text=state, font='diagram_bold8',
+                                      **text_style[is_current])
+            self.track(canvas, state, oval, fill_style)
+            self.track(canvas, state, text, text_style)
 
         # Draw initial arrow to S0
         canvas.create_line(x0 - r - 25, y0, x0 - r - 2, y0, arrow=tk.LAST, width=2, fill='#333')
 
         # Labels
-        canvas.create_text(w/2, 15, text="Eye Drop Path (RM35)", font=('Arial', 10, 'bold'), fill='#FF9800')
-        canvas.create_text(w/2, h - 8, text="Vitamin Path (RM50)", font=('Arial', 10, 'bold'), fill='#E91E63')
+        canvas.create_text(w/2, 15, text="Eye Drop Path (RM35)", font='diagram_bold10', fill='#FF9800')
+        canvas.create_text(w/2, h - 8, text="Vitamin Path (RM50)", font='diagram_bold10', fill='#E91E63')
 
     def draw_nfa(self, canvas, w, h, machine, current):
         """Draw NFA diagram."""
@@ -978,26 +1343,30 @@ class ComparisonGUI:
             else:
                 base_color = '#2196F3'
 
-            fill = base_color if is_current else 'white'
-            text_color = 'white' if is_current else '#333'
+            fill_style = ({'fill': 'white'}, {'fill': base_color})
+            text_style = ({'fill': '#333'}, {'fill': 'white'})
 
             if is_accepting:
                 canvas.create_oval(x-r-4, y-r-4, x+r+4, y+r+4, outline='#333', width=2)
 
-            canvas.create_oval(x-r, y-r, x+r, y+r, fill=fill, outline='#333', width=2)
+            oval = canvas.create_oval(x-r, y-r, x+r, y+r, outline='#333', width=2,
+                                      **fill_style[is_current])
 
             # Shorter labels
             label = state.replace('_READY', '').replace('DISPENSE', 'DISP')
-            canvas.create_text(x, y, text=label, font=('Arial', 7, 'bold'), fill=text_color)
+            text = canvas.create_text(x, y, text=label, font='diagram_bold7',
+                                      **text_style[is_current])
+            self.track(canvas, state, oval, fill_style)
+            self.track(canvas, state, text, text_style)
 
         # NFA indicator
         canvas.create_text(w/2, 15, text="NFA: Can be in multiple states (epsilon transitions shown dashed)",
-                          font=('Arial', 9, 'italic'), fill='#666')
+                          font='diagram_italic9', fill='#666')
 
         # Current states indicator
         states_str = ', '.join(sorted(current))
         canvas.create_text(w/2, h - 5, text=f"Current: {{{states_str}}}",
-                          font=('Arial', 9, 'bold'), fill='#1976D2')
+                          font='diagram_bold9', fill='#1976D2', tags='current_states')
 
     def run(self):
         self.root.mainloop()
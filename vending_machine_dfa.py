@@ -0,0 +1,74 @@
+"""
+Healthcare Vending Machine DFA - transition tables
+==================================================
+The DFA behind vending_machine_streamlit.py, as index-based tables.
+
+Kept free of Streamlit so the tables can be imported and checked without
+starting the page.
+"""
+
+from typing import Final
+
+import numpy as np
+
+ACCEPTING_STATES: Final = frozenset({'Q7', 'Q8', 'Q9', 'Q10'})
+
+# States, inputs and per-state data, all indexed by position
+STATE_NAMES: Final = ('Q0', 'Q1', 'Q2', 'Q3', 'Q4', 'Q5', 'Q6', 'Q7', 'Q8', 'Q9', 'Q10')
+SYMBOLS: Final = ('RM5', 'RM10', 'RM20', 'e', 'v')
+STATE_IDX: Final = {state: i for i, state in enumerate(STATE_NAMES)}
+SYM_IDX: Final = {symbol: j for j, symbol in enumerate(SYMBOLS)}
+
+# Value in RM of each money input
+COIN_VALUES: Final = {'RM5': 5, 'RM10': 10, 'RM20': 20}
+
+BALANCES: Final = (0, 5, 10, 15, 20, 25, 30, 35, 40, 45, 50)
+DESCRIPTIONS: Final = (
+    'No money inserted',
+    'RM5 inserted',
+    'RM10 inserted',
+    'RM15 inserted',
+    'RM20 inserted',
+    'RM25 inserted',
+    'RM30 inserted',
+    'RM35 - Eye Drop ready!',
+    'RM40 - Eye Drop ready!',
+    'RM45 - Eye Drop ready!',
+    'RM50 - Both products ready!',
+)
+
+def _build_delta_tbl():
+    """δ as DELTA_TBL[state index, symbol index] -> state index.
+
+    Money adds to the balance, saturating at RM50. 'e' returns an accepting
+    state to Q0 and 'v' returns Q10 to Q0; otherwise products are no-ops.
+    """
+    balances = np.array(BALANCES)
+    state_ids = np.arange(len(STATE_NAMES))
+    accepting = np.array([state in ACCEPTING_STATES for state in STATE_NAMES])
+
+    table = np.empty((len(STATE_NAMES), len(SYMBOLS)), dtype=np.int8)
+    coin_cols = [SYM_IDX[coin] for coin in COIN_VALUES]
+    money = np.minimum(balances[:, None] + np.array(list(COIN_VALUES.values())),
+                       balances[-1])
+    table[:, coin_cols] = np.searchsorted(balances, money)
+    table[:, SYM_IDX['e']] = np.where(accepting, 0, state_ids)
+    table[:, SYM_IDX['v']] = np.where(state_ids == STATE_IDX['Q10'], 0, state_ids)
+    return table
+
+DELTA_TBL: Final = _build_delta_tbl()
+DELTA_TBL.setflags(write=False)
+
+# Product dispensed by each transition: leaving an accepting state for Q0
+# on 'e' or 'v'
+_PRODUCTS: Final = {'e': 'Eye Drop', 'v': 'Vitamin'}
+DISPENSE_TBL: Final = tuple(
+    tuple(_PRODUCTS.get(symbol) if state in ACCEPTING_STATES and DELTA_TBL[i, j] == 0
+          else None
+          for j, symbol in enumerate(SYMBOLS))
+    for i, state in enumerate(STATE_NAMES)
+)
+
+# Bit i set <=> state i is accepting
+ACCEPT_MASK: Final = sum(1 << STATE_IDX[state] for state in ACCEPTING_STATES)
+VITAMIN_IDX: Final = STATE_IDX['Q10']
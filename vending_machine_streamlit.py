@@ -4,51 +4,152 @@ Healthcare Vending Machine DFA - Streamlit Web App
 A web-based DFA simulation using Streamlit.
 
 To run locally:
-    pip install streamlit
+    pip install streamlit numpy pandas
     streamlit run vending_machine_streamlit.py
 
 To deploy free on Streamlit Cloud:
-    1. Push this file to GitHub
+    1. Push this file and vending_machine_dfa.py to GitHub
     2. Go to share.streamlit.io
     3. Connect your GitHub repo
     4. Deploy!
 """
 
+from collections import deque
+from typing import Final
+
+import numpy as np
+import pandas as pd
 import streamlit as st
 
+from vending_machine_dfa import (
+    ACCEPT_MASK,
+    ACCEPTING_STATES,
+    BALANCES,
+    DELTA_TBL,
+    DESCRIPTIONS,
+    DISPENSE_TBL,
+    STATE_IDX,
+    STATE_NAMES,
+    SYM_IDX,
+    SYMBOLS,
+    VITAMIN_IDX,
+)
+
 # ============================================================
 # DFA DEFINITION
 # ============================================================
-
-ACCEPTING_STATES = {'Q7', 'Q8', 'Q9', 'Q10'}
-
-DELTA = {
-    'Q0':  {'RM5': 'Q1',  'RM10': 'Q2',  'RM20': 'Q4',  'e': 'Q0',  'v': 'Q0'},
-    'Q1':  {'RM5': 'Q2',  'RM10': 'Q3',  'RM20': 'Q5',  'e': 'Q1',  'v': 'Q1'},
-    'Q2':  {'RM5': 'Q3',  'RM10': 'Q4',  'RM20': 'Q6',  'e': 'Q2',  'v': 'Q2'},
-    'Q3':  {'RM5': 'Q4',  'RM10': 'Q5',  'RM20': 'Q7',  'e': 'Q3',  'v': 'Q3'},
-    'Q4':  {'RM5': 'Q5',  'RM10': 'Q6',  'RM20': 'Q8',  'e': 'Q4',  'v': 'Q4'},
-    'Q5':  {'RM5': 'Q6',  'RM10': 'Q7',  'RM20': 'Q9',  'e': 'Q5',  'v': 'Q5'},
-    'Q6':  {'RM5': 'Q7',  'RM10': 'Q8',  'RM20': 'Q10', 'e': 'Q6',  'v': 'Q6'},
-    'Q7':  {'RM5': 'Q8',  'RM10': 'Q9',  'RM20': 'Q10', 'e': 'Q0',  'v': 'Q7'},
-    'Q8':  {'RM5': 'Q9',  'RM10': 'Q10', 'RM20': 'Q10', 'e': 'Q0',  'v': 'Q8'},
-    'Q9':  {'RM5': 'Q10', 'RM10': 'Q10', 'RM20': 'Q10', 'e': 'Q0',  'v': 'Q9'},
-    'Q10': {'RM5': 'Q10', 'RM10': 'Q10', 'RM20': 'Q10', 'e': 'Q0',  'v': 'Q0'},
+# δ and the per-state tables live in vending_machine_dfa; below are the
+# labels and messages the page derives from them
+
+# Balance label per state
+BALANCE_LABELS: Final = tuple(f"RM{b}" for b in BALANCES)
+
+def _purchase_msg(s_idx, balance):
+    """(st message function name, text) saying what state s_idx can buy."""
+    if s_idx == VITAMIN_IDX:
+        return ('success', "Both Eye Drop and Vitamin available!")
+    if STATE_NAMES[s_idx] in ACCEPTING_STATES:
+        return ('warning', f"Eye Drop ready! Need RM{50 - balance} more for Vitamin")
+    return ('info', f"Need RM{max(0, 35 - balance)} for Eye Drop, "
+                    f"RM{max(0, 50 - balance)} for Vitamin")
+
+PURCHASE_MSG: Final = tuple(_purchase_msg(i, b) for i, b in enumerate(BALANCES))
+
+# History tab labels for each input symbol
+SYMBOL_DISPLAY: Final = {
+    'RM5': '💵 RM5',
+    'RM10': '💵 RM10',
+    'RM20': '💵 RM20',
+    'e': '👁️ Eye Drop',
+    'v': '💊 Vitamin'
 }
 
-STATE_INFO = {
-    'Q0':  (0,  'No money inserted'),
-    'Q1':  (5,  'RM5 inserted'),
-    'Q2':  (10, 'RM10 inserted'),
-    'Q3':  (15, 'RM15 inserted'),
-    'Q4':  (20, 'RM20 inserted'),
-    'Q5':  (25, 'RM25 inserted'),
-    'Q6':  (30, 'RM30 inserted'),
-    'Q7':  (35, 'RM35 - Eye Drop ready!'),
-    'Q8':  (40, 'RM40 - Eye Drop ready!'),
-    'Q9':  (45, 'RM45 - Eye Drop ready!'),
-    'Q10': (50, 'RM50 - Both products ready!'),
-}
+# Money buttons: (label, input symbol)
+MONEY_BUTTONS: Final = (('RM5', 'RM5'), ('RM10', 'RM10'), ('RM20', 'RM20'))
+
+# Views of the right column
+VIEWS: Final = ("📊 State Diagram", "📜 History", "📖 DFA Definition")
+
+# Only the most recent transitions are kept in the session
+HISTORY_LIMIT: Final = 200
+
+# ============================================================
+# STATIC PAGE CONTENT
+# ============================================================
+
+MERMAID_CODE: Final = """
+stateDiagram-v2
+    direction LR
+    [*] --> Q0
+
+    Q0 --> Q1 : RM5
+    Q0 --> Q2 : RM10
+    Q0 --> Q4 : RM20
+
+    Q1 --> Q2 : RM5
+    Q1 --> Q3 : RM10
+    Q1 --> Q5 : RM20
+
+    Q2 --> Q3 : RM5
+    Q2 --> Q4 : RM10
+    Q2 --> Q6 : RM20
+
+    Q3 --> Q4 : RM5
+    Q3 --> Q5 : RM10
+    Q3 --> Q7 : RM20
+
+    Q4 --> Q5 : RM5
+    Q4 --> Q6 : RM10
+    Q4 --> Q8 : RM20
+
+    Q5 --> Q6 : RM5
+    Q5 --> Q7 : RM10
+    Q5 --> Q9 : RM20
+
+    Q6 --> Q7 : RM5
+    Q6 --> Q8 : RM10
+    Q6 --> Q10 : RM20
+
+    Q7 --> Q8 : RM5
+    Q7 --> Q9 : RM10
+    Q7 --> Q10 : RM20
+    Q7 --> Q0 : e
+
+    Q8 --> Q9 : RM5
+    Q8 --> Q10 : RM10,RM20
+    Q8 --> Q0 : e
+
+    Q9 --> Q10 : RM5,RM10,RM20
+    Q9 --> Q0 : e
+
+    Q10 --> Q0 : e,v
+"""
+
+MERMAID_MD: Final = f"```mermaid{MERMAID_CODE}```"
+
+DFA_DEFINITION_MD: Final = """
+**5-tuple: (Q, Σ, δ, q₀, F)**
+
+| Component | Definition |
+|-----------|------------|
+| **Q** (States) | {Q0, Q1, Q2, Q3, Q4, Q5, Q6, Q7, Q8, Q9, Q10} |
+| **Σ** (Alphabet) | {RM5, RM10, RM20, e, v} |
+| **δ** (Transition) | See transition table below |
+| **q₀** (Initial) | Q0 |
+| **F** (Accepting) | {Q7, Q8, Q9, Q10} |
+"""
+
+DFA_NOTES_MD: Final = """
+### Products
+- **Eye Drop**: RM35 (available in Q7, Q8, Q9, Q10)
+- **Vitamin**: RM50 (available only in Q10)
+
+### How It Works
+1. Insert money (RM5, RM10, or RM20) to accumulate balance
+2. Each state represents the total money inserted
+3. When you reach an accepting state, you can dispense products
+4. Selecting a product returns you to Q0 (initial state)
+"""
 
 # ============================================================
 # STREAMLIT APP
@@ -61,50 +162,79 @@ st.set_page_config(
     layout="wide"
 )
 
-# Initialize session state
-if 'current_state' not in st.session_state:
-    st.session_state.current_state = 'Q0'
-if 'history' not in st.session_state:
-    st.session_state.history = []
+# Initialize session state (one membership probe per rerun)
+ss = st.session_state
+if 'initialized' not in ss:
+    ss.current_state = 'Q0'
+    ss.history = deque(maxlen=HISTORY_LIMIT)
+    ss.initialized = True
 
 def transition(symbol):
     """Apply DFA transition and return dispensed item if any."""
-    old_state = st.session_state.current_state
-    new_state = DELTA.get(old_state, {}).get(symbol, old_state)
-
-    dispensed = None
-    if old_state in ACCEPTING_STATES and new_state == 'Q0':
-        if symbol == 'e':
-            dispensed = 'Eye Drop'
-        elif symbol == 'v':
-            dispensed = 'Vitamin'
-
-    st.session_state.current_state = new_state
-    st.session_state.history.append((old_state, symbol, new_state, dispensed))
+    s_idx = STATE_IDX[ss.current_state]
+    sym_idx = SYM_IDX[symbol]
+    ns_idx = int(DELTA_TBL[s_idx, sym_idx])
+    dispensed = DISPENSE_TBL[s_idx][sym_idx]
+
+    ss.current_state = STATE_NAMES[ns_idx]
+    # History holds (step, old, symbol, new, dispensed) with indices into
+    # STATE_NAMES/SYMBOLS. The step number keeps counting once the deque is
+    # full and drops its oldest entries.
+    history = ss.history
+    step = history[-1][0] + 1 if history else 1
+    history.append((step, s_idx, sym_idx, ns_idx, dispensed))
 
     return dispensed
 
+def dispense(symbol):
+    """Apply a product transition and celebrate if something was dispensed."""
+    dispensed = transition(symbol)
+    if dispensed:
+        st.balloons()
+        st.toast(f"🎉 {dispensed} dispensed!")
+
 def reset_machine():
     """Reset the DFA to initial state."""
-    st.session_state.current_state = 'Q0'
-    st.session_state.history = []
-
-def get_balance():
-    """Get current balance from state."""
-    return STATE_INFO.get(st.session_state.current_state, (0, ''))[0]
-
-def is_accepting():
-    """Check if current state is accepting."""
-    return st.session_state.current_state in ACCEPTING_STATES
-
-def can_buy_vitamin():
-    """Check if Vitamin can be purchased."""
-    return st.session_state.current_state == 'Q10'
+    ss.current_state = 'Q0'
+    ss.history = deque(maxlen=HISTORY_LIMIT)
+
+def is_accepting(s_idx):
+    """Check if the state with index s_idx is accepting."""
+    return bool((ACCEPT_MASK >> s_idx) & 1)
+
+def can_buy_vitamin(s_idx):
+    """Check if Vitamin can be purchased in the state with index s_idx."""
+    return s_idx == VITAMIN_IDX
+
+# The tables below are shared across sessions: never modify them in place
+
+@st.cache_resource
+def state_table():
+    """State Overview table, with an empty current-state marker column."""
+    return pd.DataFrame({
+        "": [""] * len(STATE_NAMES),
+        "State": STATE_NAMES,
+        "Balance": BALANCE_LABELS,
+        "Accepting": ["✅" if is_accepting(i) else "" for i in range(len(STATE_NAMES))],
+        "Description": DESCRIPTIONS,
+    })
+
+@st.cache_resource
+def transition_table():
+    """Transition table (δ) with state names in each cell."""
+    table = pd.DataFrame(np.asarray(STATE_NAMES)[DELTA_TBL], columns=SYMBOLS)
+    table.insert(0, "State", STATE_NAMES)
+    return table
 
 # ============================================================
 # UI LAYOUT
 # ============================================================
 
+# Button callbacks have already run by now, so bind this run's state once;
+# only transition() and reset_machine() write back to the session
+state = ss.current_state
+history = ss.history
+
 # Title
 st.title("🏥 Healthcare Vending Machine")
 st.markdown("**DFA Simulation** - Eye Drop (RM35) | Vitamin (RM50)")
@@ -117,9 +247,11 @@ with col_left:
     # Current State Display
     st.markdown("### Current State")
 
-    state = st.session_state.current_state
-    balance = get_balance()
-    accepting = is_accepting()
+    # Derive everything shown below from the state index
+    s_idx = STATE_IDX[state]
+    description = DESCRIPTIONS[s_idx]
+    accepting = is_accepting(s_idx)
+    can_vit = can_buy_vitamin(s_idx)
 
     # State badge with color
     if accepting:
@@ -129,216 +261,96 @@ with col_left:
         st.info(f"## {state}")
         st.markdown("**Status:** ⏳ REJECT (need more money)")
 
-    st.markdown(f"**Balance:** RM{balance}")
-    st.markdown(f"**Description:** {STATE_INFO.get(state, (0, 'Unknown'))[1]}")
+    st.markdown(f"**Balance:** {BALANCE_LABELS[s_idx]}")
+    st.markdown(f"**Description:** {description}")
 
     st.divider()
 
     # Money Buttons
+    # Buttons apply transitions in on_click callbacks, which Streamlit runs
+    # before the rerun a click triggers, so that one run shows the new state
     st.markdown("### 💵 Insert Money")
 
-    money_cols = st.columns(3)
-    with money_cols[0]:
-        if st.button("RM5", use_container_width=True, type="primary"):
-            transition('RM5')
-            st.rerun()
-    with money_cols[1]:
-        if st.button("RM10", use_container_width=True, type="primary"):
-            transition('RM10')
-            st.rerun()
-    with money_cols[2]:
-        if st.button("RM20", use_container_width=True, type="primary"):
-            transition('RM20')
-            st.rerun()
+    for (label, symbol), col in zip(MONEY_BUTTONS, st.columns(len(MONEY_BUTTONS))):
+        with col:
+            st.button(label, use_container_width=True, type="primary", key=f"btn_{symbol}",
+                      on_click=transition, args=(symbol,))
 
     st.divider()
 
     # Product Buttons
     st.markdown("### 🛒 Select Product")
 
-    prod_cols = st.columns(2)
-    with prod_cols[0]:
-        eye_disabled = not is_accepting()
-        if st.button("👁️ Eye Drop\n(RM35)", use_container_width=True, disabled=eye_disabled):
-            dispensed = transition('e')
-            if dispensed:
-                st.balloons()
-                st.toast(f"🎉 {dispensed} dispensed!")
-            st.rerun()
-
-    with prod_cols[1]:
-        vit_disabled = not can_buy_vitamin()
-        if st.button("💊 Vitamin\n(RM50)", use_container_width=True, disabled=vit_disabled):
-            dispensed = transition('v')
-            if dispensed:
-                st.balloons()
-                st.toast(f"🎉 {dispensed} dispensed!")
-            st.rerun()
+    product_buttons = (
+        ("👁️ Eye Drop\n(RM35)", 'e', accepting),
+        ("💊 Vitamin\n(RM50)", 'v', can_vit),
+    )
+    for (label, symbol, enabled), col in zip(product_buttons, st.columns(len(product_buttons))):
+        with col:
+            st.button(label, use_container_width=True, disabled=not enabled, key=f"btn_{symbol}",
+                      on_click=dispense, args=(symbol,))
 
     # Info about what can be purchased
-    if is_accepting():
-        if can_buy_vitamin():
-            st.success("Both Eye Drop and Vitamin available!")
-        else:
-            need = 50 - balance
-            st.warning(f"Eye Drop ready! Need RM{need} more for Vitamin")
-    else:
-        need_eye = max(0, 35 - balance)
-        need_vit = max(0, 50 - balance)
-        st.info(f"Need RM{need_eye} for Eye Drop, RM{need_vit} for Vitamin")
+    kind, msg = PURCHASE_MSG[s_idx]
+    getattr(st, kind)(msg)
 
     st.divider()
 
     # Reset Button
-    if st.button("🔄 Reset Machine", use_container_width=True, type="secondary"):
-        reset_machine()
-        st.rerun()
+    st.button("🔄 Reset Machine", use_container_width=True, type="secondary",
+              on_click=reset_machine)
 
 # RIGHT COLUMN - State Diagram & History
 with col_right:
-    # Tabs for diagram and history
-    tab1, tab2, tab3 = st.tabs(["📊 State Diagram", "📜 History", "📖 DFA Definition"])
+    # Tab-like switch for diagram and history. Unlike st.tabs, which runs
+    # every tab's body on each rerun, only the selected view is rendered.
+    view = st.radio("View", VIEWS, horizontal=True, label_visibility="collapsed", key="view")
 
-    with tab1:
+    if view == VIEWS[0]:
         st.markdown("### DFA State Diagram")
         st.markdown("*Current state is highlighted*")
 
         # Create a simple visual representation using Mermaid
-        current = st.session_state.current_state
-
-        # Build mermaid diagram
-        mermaid_code = """
-        stateDiagram-v2
-            direction LR
-            [*] --> Q0
-
-            Q0 --> Q1 : RM5
-            Q0 --> Q2 : RM10
-            Q0 --> Q4 : RM20
-
-            Q1 --> Q2 : RM5
-            Q1 --> Q3 : RM10
-            Q1 --> Q5 : RM20
-
-            Q2 --> Q3 : RM5
-            Q2 --> Q4 : RM10
-            Q2 --> Q6 : RM20
-
-            Q3 --> Q4 : RM5
-            Q3 --> Q5 : RM10
-            Q3 --> Q7 : RM20
-
-            Q4 --> Q5 : RM5
-            Q4 --> Q6 : RM10
-            Q4 --> Q8 : RM20
-
-            Q5 --> Q6 : RM5
-            Q5 --> Q7 : RM10
-            Q5 --> Q9 : RM20
-
-            Q6 --> Q7 : RM5
-            Q6 --> Q8 : RM10
-            Q6 --> Q10 : RM20
-
-            Q7 --> Q8 : RM5
-            Q7 --> Q9 : RM10
-            Q7 --> Q10 : RM20
-            Q7 --> Q0 : e
-
-            Q8 --> Q9 : RM5
-            Q8 --> Q10 : RM10,RM20
-            Q8 --> Q0 : e
-
-            Q9 --> Q10 : RM5,RM10,RM20
-            Q9 --> Q0 : e
-
-            Q10 --> Q0 : e,v
-        """
-
-        st.markdown(f"""
-        ```mermaid
-        {mermaid_code}
-        ```
-        """)
+        st.markdown(MERMAID_MD)
 
         # Show state table
         st.markdown("### State Overview")
 
-        # Create state table
-        state_data = []
-        for s in ['Q0', 'Q1', 'Q2', 'Q3', 'Q4', 'Q5', 'Q6', 'Q7', 'Q8', 'Q9', 'Q10']:
-            balance_val, desc = STATE_INFO[s]
-            is_current = "👉" if s == current else ""
-            is_accept = "✅" if s in ACCEPTING_STATES else ""
-            state_data.append({
-                "": is_current,
-                "State": s,
-                "Balance": f"RM{balance_val}",
-                "Accepting": is_accept,
-                "Description": desc
-            })
-
-        st.dataframe(state_data, use_container_width=True, hide_index=True)
-
-    with tab2:
+        # Cached state table with the current-state marker filled in
+        marker = [""] * len(STATE_NAMES)
+        marker[STATE_IDX[state]] = "👉"
+        st.dataframe(state_table().assign(**{"": marker}),
+                     use_container_width=True, hide_index=True)
+
+    elif view == VIEWS[1]:
         st.markdown("### Transition History")
 
-        if st.session_state.history:
-            # Show history in reverse (newest first)
-            for i, (old, symbol, new, dispensed) in enumerate(reversed(st.session_state.history)):
-                symbol_display = {
-                    'RM5': '💵 RM5',
-                    'RM10': '💵 RM10',
-                    'RM20': '💵 RM20',
-                    'e': '👁️ Eye Drop',
-                    'v': '💊 Vitamin'
-                }.get(symbol, symbol)
-
-                if dispensed:
-                    st.success(f"**{len(st.session_state.history) - i}.** {old} → {new} [{symbol_display}] 🎉 **{dispensed} dispensed!**")
-                else:
-                    st.markdown(f"**{len(st.session_state.history) - i}.** {old} → {new} [{symbol_display}]")
+        if history:
+            # One table, newest first, instead of one element per transition
+            rows = [
+                {
+                    "#": step,
+                    "From": STATE_NAMES[o_idx],
+                    "Input": SYMBOL_DISPLAY[SYMBOLS[sym_idx]],
+                    "To": STATE_NAMES[n_idx],
+                    "Dispensed": f"🎉 {dispensed}" if dispensed else "",
+                }
+                for step, o_idx, sym_idx, n_idx, dispensed in reversed(history)
+            ]
+            st.dataframe(rows, use_container_width=True, hide_index=True)
         else:
             st.info("No transitions yet. Insert money to begin!")
 
-    with tab3:
+    else:
         st.markdown("### Formal DFA Definition")
 
-        st.markdown("""
-        **5-tuple: (Q, Σ, δ, q₀, F)**
-
-        | Component | Definition |
-        |-----------|------------|
-        | **Q** (States) | {Q0, Q1, Q2, Q3, Q4, Q5, Q6, Q7, Q8, Q9, Q10} |
-        | **Σ** (Alphabet) | {RM5, RM10, RM20, e, v} |
-        | **δ** (Transition) | See transition table below |
-        | **q₀** (Initial) | Q0 |
-        | **F** (Accepting) | {Q7, Q8, Q9, Q10} |
-        """)
+        st.markdown(DFA_DEFINITION_MD)
 
         st.markdown("### Transition Table (δ)")
 
-        # Create transition table
-        trans_data = []
-        for state in ['Q0', 'Q1', 'Q2', 'Q3', 'Q4', 'Q5', 'Q6', 'Q7', 'Q8', 'Q9', 'Q10']:
-            row = {"State": state}
-            for symbol in ['RM5', 'RM10', 'RM20', 'e', 'v']:
-                row[symbol] = DELTA[state][symbol]
-            trans_data.append(row)
-
-        st.dataframe(trans_data, use_container_width=True, hide_index=True)
-
-        st.markdown("""
-        ### Products
-        - **Eye Drop**: RM35 (available in Q7, Q8, Q9, Q10)
-        - **Vitamin**: RM50 (available only in Q10)
-
-        ### How It Works
-        1. Insert money (RM5, RM10, or RM20) to accumulate balance
-        2. Each state represents the total money inserted
-        3. When you reach an accepting state, you can dispense products
-        4. Selecting a product returns you to Q0 (initial state)
-        """)
+        st.dataframe(transition_table(), use_container_width=True, hide_index=True)
+
+        st.markdown(DFA_NOTES_MD)
 
 # Footer
 st.divider()